@@ -0,0 +1,86 @@
+from collections.abc import Callable
+
+# https://discord.com/developers/docs/resources/message#create-message
+MAX_CONTENT_LENGTH: int = 2000
+MAX_EMBEDS_PER_MESSAGE: int = 10
+MAX_EMBED_TITLE_LENGTH: int = 256
+MAX_EMBED_DESCRIPTION_LENGTH: int = 4096
+# Combined title/description/field/footer/author characters of all embeds in one message
+MAX_EMBED_TOTAL_LENGTH: int = 6000
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def embed_length(embed: dict) -> int:
+    """Count the characters of an embed that Discord charges against the 6000 per-message limit."""
+    length: int = len(embed.get("title", "")) + len(embed.get("description", ""))
+    length += len(embed.get("footer", {}).get("text", "")) + len(embed.get("author", {}).get("name", ""))
+    for field in embed.get("fields", []):
+        length += len(field.get("name", "")) + len(field.get("value", ""))
+    return length
+
+
+class DiscordMessagePacker:
+    """Packs text blocks and embeds into as few Discord webhook messages as the limits allow.
+
+    Blocks are never split: a message is sent as soon as the next block would
+    push it past the 2000 character content limit, the 10 embeds limit or the
+    6000 character combined embed limit. Discord renders a message's content
+    above its embeds, so text added after embeds starts a new message to keep
+    the reading order.
+
+    Content is collected in a list and joined once per message rather than
+    grown with `+=`.
+
+    Args:
+        send: Called with each full webhook payload ({"content": ..., "embeds": [...]}).
+    """
+
+    def __init__(self, send: Callable[[dict], None]) -> None:
+        self.send = send
+        self.messages_sent: int = 0
+        self._content_parts: list[str] = []
+        self._content_length: int = 0
+        self._embeds: list[dict] = []
+        self._embeds_length: int = 0
+
+    def add_text(self, text: str) -> None:
+        """Append a block of markdown to the message content, starting a new message if it does not fit."""
+        text = _truncate(text, MAX_CONTENT_LENGTH)
+        if self._embeds or self._content_length + len(text) > MAX_CONTENT_LENGTH:
+            self.flush()
+        self._content_parts.append(text)
+        self._content_length += len(text)
+
+    def add_embed(self, embed: dict) -> None:
+        """Append an embed, starting a new message if the embed limits would be exceeded."""
+        if "title" in embed:
+            embed["title"] = _truncate(embed["title"], MAX_EMBED_TITLE_LENGTH)
+        if "description" in embed:
+            embed["description"] = _truncate(embed["description"], MAX_EMBED_DESCRIPTION_LENGTH)
+        length: int = embed_length(embed)
+        if (
+            len(self._embeds) >= MAX_EMBEDS_PER_MESSAGE
+            or self._embeds_length + length > MAX_EMBED_TOTAL_LENGTH
+        ):
+            self.flush()
+        self._embeds.append(embed)
+        self._embeds_length += length
+
+    def flush(self) -> None:
+        """Send whatever is buffered as one message; does nothing when the buffer is empty."""
+        if not self._content_parts and not self._embeds:
+            return
+        payload: dict = {}
+        if self._content_parts:
+            payload["content"] = "".join(self._content_parts)
+        if self._embeds:
+            payload["embeds"] = self._embeds
+        self.send(payload)
+        self.messages_sent += 1
+        self._content_parts = []
+        self._content_length = 0
+        self._embeds = []
+        self._embeds_length = 0
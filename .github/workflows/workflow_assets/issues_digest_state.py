@@ -0,0 +1,76 @@
+from collections.abc import Iterable
+import json
+
+# github/ is on sys.path (added by periodic_issues_notification.py) for the shared JSON writer
+from json_files import write_json_atomic
+
+# Only the fields the Discord formatter renders are kept for cached open issues
+ISSUE_FIELDS: tuple[str, ...] = ("number", "title", "state", "created_at", "updated_at", "html_url")
+
+
+def new_digest_state() -> dict:
+    """Return an empty digest state (no watermark, no cached issues)."""
+    return {"watermark": None, "open_issues": {}}
+
+
+def load_digest_state(path: str) -> dict | None:
+    """Load the digest state persisted by a previous run.
+
+    Args:
+        path: Location of the JSON state file (restored by the workflow's cache step).
+
+    Returns:
+        dict | None: The saved state, or None when there is no usable state file.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            state: dict = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not state.get("watermark"):
+        return None
+    return state
+
+
+def save_digest_state(path: str, state: dict) -> None:
+    """Persist the digest state for the next run."""
+    write_json_atomic(path, state)
+
+
+def _compact_issue(issue: dict) -> dict:
+    compact: dict = {field: issue.get(field) for field in ISSUE_FIELDS}
+    compact["user"] = {"login": issue["user"]["login"]}
+    return compact
+
+
+def apply_issue_updates(state: dict, issues: Iterable[dict]) -> dict:
+    """Fold issues updated since the watermark into the cached open issues.
+
+    Each issue's effect depends only on the issue itself, so replaying an
+    issue that was already applied (the `since` filter is inclusive) changes
+    nothing: an open issue is added to / refreshed in the open issues, and a
+    closed one is removed from them. The open and closed totals are not kept
+    here; they come from the server-side count (`get_gh_issue_counts`).
+
+    Args:
+        state: Digest state from `load_digest_state` or `new_digest_state`.
+        issues: Issues updated since `state["watermark"]` (any iterable, consumed once).
+
+    Returns:
+        dict: The updated state with the watermark moved to the newest `updated_at` seen.
+    """
+    open_issues: dict[str, dict] = state["open_issues"]
+    watermark: str | None = state["watermark"]
+
+    for issue in issues:
+        key: str = str(issue["number"])
+        if issue["state"] == "closed":
+            open_issues.pop(key, None)
+        else:
+            open_issues[key] = _compact_issue(issue)
+
+        if watermark is None or issue["updated_at"] > watermark:
+            watermark = issue["updated_at"]
+
+    state["watermark"] = watermark
+    return state
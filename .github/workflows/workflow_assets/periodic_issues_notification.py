@@ -1,103 +1,131 @@
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
 import os
+import sys
 
-import httpx
+# The repository root goes first: github/utils.py would otherwise shadow the root `utils` package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "github")))
 
+from discord_message_packer import DiscordMessagePacker
+from github_cache import cache_from_env
+from github_client import GitHubClient
+from github_graphql import get_repository_issue_counts
+from github_pagination import iter_pages
+from issues_digest_state import apply_issue_updates, load_digest_state, new_digest_state, save_digest_state
+from utils.discord_delivery import BackgroundDiscordDelivery
 
-def get_gh_issues(github_repository: str | None = None, desired_issue_state: str = "all") -> list[dict]:
-    """Get GitHub issues from the repository with pagination support.
 
-    Fetches all issues from the repository by automatically handling pagination.
-    Uses per_page=100 to maximize items per request and follows Link headers
-    to fetch all pages.
+def get_gh_issue_counts(github_repository: str | None = None) -> dict[str, int]:
+    """Get the repository's open and closed issue totals without paging through the issues.
+
+    The totals are counted server side by one GraphQL query, so the cost does
+    not grow with the number of closed issues. Pull requests are not counted.
 
     Args:
-        github_repository: GitHub repository in the format "owner/repo" (e.g.,
-            "scondo-prof/the_ticketing_system"). If None, attempts to read from
-            the GITHUB_REPOSITORY environment variable. If not available,
-            defaults to an empty string.
-        desired_issue_state: The state of issues to retrieve. Valid values are
-            "open", "closed", or "all". Defaults to "all".
+        github_repository: GitHub repository in the format "owner/repo". If
+            None, attempts to read from the GITHUB_REPOSITORY environment
+            variable.
 
     Returns:
-        list[dict]: A list of all issues from all pages combined.
+        dict[str, int]: {"open": <count>, "closed": <count>}.
 
     Raises:
-        Exception: If the GitHub API returns a non-200 status code.
-
-    Note:
-        - Automatically handles pagination to fetch all issues.
-        - Uses per_page=100 to minimize the number of API requests.
-        - Requires GITHUB_TOKEN environment variable to be set.
+        Exception: If the GitHub API returns an error.
     """
-    # Get GitHub repository from parameter or environment variable
     if github_repository is None:
         github_repository: str = os.getenv("GITHUB_REPOSITORY", "")
 
-    all_issues: list[dict] = []
-    page: int = 1
-    per_page: int = 100
-
-    headers: dict[str, str] = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {os.getenv('GITHUB_TOKEN')}",
-    }
-
-    while True:
-        url: str = (
-            f"https://api.github.com/repos/{github_repository}/issues"
-            f"?state={desired_issue_state}&page={page}&per_page={per_page}"
-        )
-
-        response: httpx.Response = httpx.get(url, headers=headers)
+    client: GitHubClient = GitHubClient(token=os.getenv("GITHUB_TOKEN", ""))
+    try:
+        issue_counts: dict[str, int] = get_repository_issue_counts(client, github_repository)
+    except Exception as e:
+        raise Exception(f"Failed to get GitHub issue counts: {e}")
+    finally:
+        client.close()
 
-        if response.status_code != 200:
-            raise Exception(f"Failed to get GitHub issues: {response.status_code} - {response.text}")
+    print(f"Issue counts: {issue_counts}")
+    return issue_counts
 
-        page_issues: list[dict] = response.json()
 
-        # If no issues returned, we've reached the end
-        if not page_issues:
-            break
+def iter_gh_issues(
+    github_repository: str | None = None,
+    desired_issue_state: str = "all",
+    since: str | None = None,
+    include_pull_requests: bool = True,
+) -> Iterator[dict]:
+    """Stream GitHub issues from the repository one page at a time.
 
-        all_issues.extend(page_issues)
+    Issues are yielded as soon as their page arrives, and the next page is
+    downloaded in the background while the caller works through the current
+    one. Only the current and the next page are held in memory.
 
-        # If we got fewer items than per_page, we're definitely on the last page
-        if len(page_issues) < per_page:
-            break
-
-        # Check Link header for "next" rel to see if there are more pages
-        link_header: str | None = response.headers.get("Link")
-        has_next: bool = False
-
-        if link_header:
-            # Parse Link header to check for "next" rel
-            links = link_header.split(",")
-            for link in links:
-                if 'rel="next"' in link:
-                    has_next = True
-                    break
-
-        # If no "next" link found, we're done (even if we got a full page)
-        if not has_next:
-            break
-
-        # Move to next page
-        page += 1
-
-    print(f"Retrieved {len(all_issues)} issues across {page} page(s)")
-    return all_issues
+    Args:
+        github_repository: GitHub repository in the format "owner/repo". If
+            None, attempts to read from the GITHUB_REPOSITORY environment
+            variable.
+        desired_issue_state: The state of issues to retrieve. Valid values are
+            "open", "closed", or "all". Defaults to "all".
+        since: Optional ISO 8601 timestamp; only issues updated at or after
+            it are returned.
+        include_pull_requests: The issues endpoint also returns pull requests;
+            set to False to skip them.
 
+    Yields:
+        dict: One issue at a time, in the order the API returns them.
 
-def format_and_send_to_discord(issues: list[dict], github_repository: str | None = None) -> bool:
-    """Format GitHub issues data and send Discord messages in batches.
+    Raises:
+        Exception: If the GitHub API returns a non-200 status code.
+    """
+    if github_repository is None:
+        github_repository: str = os.getenv("GITHUB_REPOSITORY", "")
 
-    Takes a list of issue dictionaries, formats them into Discord-compatible markdown
-    messages, and sends them directly to Discord. Messages are sent in batches of
-    3 issues per message to avoid Discord message length limits.
+    client: GitHubClient = GitHubClient(token=os.getenv("GITHUB_TOKEN", ""), cache=cache_from_env())
+
+    params: dict[str, str] = {"state": desired_issue_state}
+    if since is not None:
+        params["since"] = since
+
+    issue_count: int = 0
+    page_count: int = 0
+    try:
+        for page_issues in iter_pages(client, f"/repos/{github_repository}/issues", params=params):
+            page_count += 1
+            if not include_pull_requests:
+                page_issues = [issue for issue in page_issues if "pull_request" not in issue]
+            issue_count += len(page_issues)
+            yield from page_issues
+    except Exception as e:
+        raise Exception(f"Failed to get GitHub issues: {e}")
+    finally:
+        if client.cache is not None:
+            print(f"GitHub response cache: {client.cache.stats()}")
+        print(f"GitHub rate limit governor: {client.governor.stats()}")
+        client.close()
+
+    print(f"Streamed {issue_count} issues across {page_count} page(s)")
+
+
+def format_and_send_to_discord(
+    issues: Iterable[dict],
+    github_repository: str | None = None,
+    closed_issue_count: int = 0,
+    open_issue_count: int | None = None,
+) -> dict:
+    """Format GitHub issues data and send them to Discord in as few messages as possible.
+
+    Takes an iterable of issue dictionaries and turns every open issue into a
+    Discord embed. A `DiscordMessagePacker` fills each webhook message with as
+    many issues as Discord's limits allow (10 embeds and 6000 embed characters
+    per message, 2000 characters of content) and only ever splits between
+    issues.
+
+    The issues are consumed incrementally, so when fed from `iter_gh_issues`
+    messages go out while later pages are still downloading and only the
+    running counters and the current message are kept in memory.
 
     Args:
-        issues: A list of issue dictionaries with the following keys:
+        issues: An iterable (list or generator) of issue dictionaries with the following keys:
             - 'number': Issue number
             - 'title': Issue title
             - 'state': Issue state (e.g., 'open', 'closed')
@@ -109,97 +137,160 @@ def format_and_send_to_discord(issues: list[dict], github_repository: str | None
             "scondo-prof/the_ticketing_system"). If None, attempts to read from
             the GITHUB_REPOSITORY environment variable. If not available,
             defaults to an empty string (links will be omitted).
+        closed_issue_count: Closed issues already counted elsewhere (e.g. by the
+            incremental digest state or a server-side count); added to the
+            closed total.
+        open_issue_count: Server-side open issue total to report in the
+            summary. If None, the open issues passed in are counted.
 
     Returns:
-        bool: True if all messages were sent successfully sent.
+        dict: Delivery stats from `BackgroundDiscordDelivery.close()`.
+
+    Raises:
+        DiscordDeliveryError: If any message could not be delivered.
 
     Note:
         - Only open issues (state != 'closed') are included in the message body.
         - Closed issues are counted separately for the summary.
-        - Messages are sent in batches of 3 issues to prevent Discord message limits.
+        - Each embed's title links to the issue on GitHub.
+        - Messages are delivered in order by a background `DiscordDeliveryQueue`
+          that paces sends by Discord's rate-limit headers and retries 429s and
+          transient failures; delivery latency and retry counts are printed at
+          the end.
         - The "Total Open Issues" and "Total Closed Issues" labels are clickable
           links that navigate to the repository's filtered issues pages on GitHub.
         - Requires DISCORD_WEBHOOK_URL environment variable to be set.
     """
 
-    discord_message: str = f"""---
-# `Open Issues` _as of_ `{datetime.now().strftime('%Y-%m-%d')}`
----------------------------------------------------
-"""
-
     # Get GitHub repository from parameter or environment variable
     if github_repository is None:
         github_repository: str = os.getenv("GITHUB_REPOSITORY", "")
 
-    total_closed_issues: int = 0
-    total_open_issues: int = 0
+    discord_webhook_url: str | None = os.getenv("DISCORD_WEBHOOK_URL")
+    if discord_webhook_url is None:
+        raise Exception("DISCORD_WEBHOOK_URL is not set")
 
-    issue_send_cutoff: int = 0
-    for issue in issues:
-        if issue["state"] == "closed":
-            total_closed_issues += 1
-        else:
-            total_open_issues += 1
-            issue_send_cutoff += 1
+    delivery: BackgroundDiscordDelivery = BackgroundDiscordDelivery(discord_webhook_url)
+    try:
+        packer: DiscordMessagePacker = DiscordMessagePacker(send=delivery.send)
+        packer.add_text(
+            f"""---
+# `Open Issues` _as of_ `{datetime.now().strftime('%Y-%m-%d')}`
+---------------------------------------------------
+"""
+        )
 
-            discord_message += f"""
-## Issue Title: {issue['number']} - {issue['title']}
+        total_closed_issues: int = closed_issue_count
+        total_open_issues: int = 0
 
-__Issue State__: `{issue['state']}`
-__Created By__: `{issue['user']['login']}`
-__Issue Created At__: `{issue['created_at']}`
-__Issue Last Update__: `{issue['updated_at']}`
-"""
-        if issue_send_cutoff >= 3:
-            send_to_discord(discord_message)
-            discord_message: str = ""
-            issue_send_cutoff: int = 0
+        for issue in issues:
+            if issue["state"] == "closed":
+                total_closed_issues += 1
+                continue
+            total_open_issues += 1
+            packer.add_embed(format_issue_embed(issue))
 
-    discord_message += f"""
+        if open_issue_count is not None:
+            total_open_issues = open_issue_count
 
+        packer.add_text(
+            f"""
 [__Total Open Issues__](https://github.com/{github_repository}/issues?q=is%3Aissue%20state%3Aopen): `{total_open_issues}`
 [__Total Closed Issues__](https://github.com/{github_repository}/issues?q=is%3Aissue%20state%3Aclosed): `{total_closed_issues}`
 ---------------------------------------------------
 """
-    send_to_discord(discord_message)
-    return True
+        )
+        packer.flush()
+        print(f"Queued {total_open_issues} open issues in {packer.messages_sent} Discord message(s)")
+    except BaseException:
+        # Stop the loop thread even when the issues iterator or the packer raises, without masking that error
+        try:
+            delivery.close()
+        except Exception as e:
+            print(f"Discord delivery also failed: {e}")
+        raise
+    return delivery.close()
+
+
+def format_issue_embed(issue: dict) -> dict:
+    """Build the Discord embed for one open issue."""
+    return {
+        "title": f"Issue Title: {issue['number']} - {issue['title']}",
+        "url": issue["html_url"],
+        "description": "\n".join(
+            (
+                f"__Issue State__: `{issue['state']}`",
+                f"__Created By__: `{issue['user']['login']}`",
+                f"__Issue Created At__: `{issue['created_at']}`",
+                f"__Issue Last Update__: `{issue['updated_at']}`",
+            )
+        ),
+    }
 
 
-def send_to_discord(discord_message: str) -> None:
-    """Send a formatted message to Discord via webhook.
+def send_incremental_digest(state_path: str, github_repository: str | None = None) -> dict:
+    """Send the issues digest using only the issues updated since the previous run.
 
-    Sends a markdown-formatted message to Discord using the webhook URL specified
-    in the DISCORD_WEBHOOK_URL environment variable.
+    The open issues are kept in a state file between runs together with a
+    watermark (the newest `updated_at` seen). Each run asks GitHub only for
+    issues updated since the watermark, folds them into the cached state,
+    sends the digest from the state and saves it for the next run. Without a
+    usable state file the state is seeded from the open issues alone. The open
+    and closed totals always come from the server-side count, so closed
+    issues are never paged through and both digest modes report the same
+    totals. Pull requests are excluded throughout.
 
     Args:
-        discord_message: The formatted Discord message string to send. Should
-            be in Discord markdown format.
+        state_path: Location of the JSON state file.
+        github_repository: GitHub repository in the format "owner/repo". If
+            None, attempts to read from the GITHUB_REPOSITORY environment
+            variable.
 
-    Raises:
-        Exception: If DISCORD_WEBHOOK_URL is not set or if the Discord API
-            returns a non-204 status code.
+    Returns:
+        dict: Delivery stats from `format_and_send_to_discord`. The state is
+            only saved once every message was delivered.
 
     Note:
-        - Expects DISCORD_WEBHOOK_URL environment variable to be set.
-        - Uses httpx for HTTP POST requests.
-        - Successful response status code is 204 (No Content).
-        - Prints success/failure messages to stdout for workflow logging.
+        - Issues deleted or transferred out of the repository never show up
+          in a `since` query; remove the state file to force a full rebuild.
     """
-    discord_webhook_url: str | None = os.getenv("DISCORD_WEBHOOK_URL")
-    if discord_webhook_url is None:
-        raise Exception("DISCORD_WEBHOOK_URL is not set")
-
-    headers: dict[str, str] = {"Content-Type": "application/json"}
-    data: dict[str, str] = {"content": discord_message}
-    response = httpx.post(discord_webhook_url, headers=headers, json=data)
-    if response.status_code == 204:
-        print(f"Message sent to Discord successfully: {response.status_code}")
+    state: dict | None = load_digest_state(state_path)
+    if state is None:
+        print("No digest state found, seeding it from the open issues")
+        # Anything that changes while the open issues are listed is updated after this and is picked up next run
+        seeded_at: str = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        state = apply_issue_updates(
+            new_digest_state(),
+            iter_gh_issues(github_repository, desired_issue_state="open", include_pull_requests=False),
+        )
+        state["watermark"] = seeded_at
     else:
-        print(f"Failed to send message to Discord: {response.status_code}")
-        print(response.text)
-        raise Exception(f"Failed to send message to Discord: {response.status_code} - {response.text}")
+        print(f"Fetching issues updated since {state['watermark']}")
+        state = apply_issue_updates(
+            state, iter_gh_issues(github_repository, since=state["watermark"], include_pull_requests=False)
+        )
+
+    issue_counts: dict[str, int] = get_gh_issue_counts(github_repository)
+    open_issues: list[dict] = sorted(state["open_issues"].values(), key=lambda issue: issue["number"], reverse=True)
+    delivery_stats: dict = format_and_send_to_discord(
+        open_issues,
+        github_repository=github_repository,
+        closed_issue_count=issue_counts["closed"],
+        open_issue_count=issue_counts["open"],
+    )
+    save_digest_state(state_path, state)
+    return delivery_stats
 
 
 if __name__ == "__main__":
-    issues: list[dict] = get_gh_issues()
-    format_and_send_to_discord(issues)
+    digest_state_path: str | None = os.getenv("ISSUES_DIGEST_STATE_PATH")
+    if digest_state_path:
+        send_incremental_digest(digest_state_path)
+    else:
+        # Totals come from a server-side count, so closed issues are never paged through
+        issue_counts: dict[str, int] = get_gh_issue_counts()
+        format_and_send_to_discord(
+            iter_gh_issues(desired_issue_state="open", include_pull_requests=False),
+            closed_issue_count=issue_counts["closed"],
+            open_issue_count=issue_counts["open"],
+        )
@@ -0,0 +1,136 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cloudFunctions", "aws", "cwLogsEventFilterSet"))
+)
+# Every Logs call goes to the local stub below; the credentials only have to exist for request signing
+os.environ["AWS_ACCESS_KEY_ID"] = "bench"
+os.environ["AWS_SECRET_ACCESS_KEY"] = "bench"
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("LAMBDAARN", "arn:aws:lambda:us-east-1:123456789012:function:bench-notifier")
+
+from cw_logs_data import create_logs_client, cw_logs_sub_filter_set
+from stub_server import StubServer, json_response
+
+THROTTLED = (
+    400,
+    {"Content-Type": "application/x-amz-json-1.1"},
+    json.dumps({"__type": "ThrottlingException", "message": "Rate exceeded"}).encode("utf-8"),
+)
+
+
+class StubLogs:
+    """Route for `StubServer` answering the CloudWatch Logs JSON API with per-call latency and a
+    calls-per-second throttle. The benchmark reaches it through a real boto3 client, so botocore's
+    retry and rate-limiting layer is part of every measurement.
+
+    Args:
+        lambda_groups: Number of /aws/lambda/ log groups.
+        other_groups: Number of log groups outside the prefix.
+        unfiltered_every: Every n-th Lambda group starts without a subscription filter.
+        latency: Seconds each API call takes.
+        rate_limit: API calls per second before ThrottlingException is returned.
+        page_size: Log groups per DescribeLogGroups page (the API maximum is 50).
+    """
+
+    def __init__(
+        self,
+        lambda_groups: int,
+        other_groups: int,
+        unfiltered_every: int,
+        latency: float,
+        rate_limit: float,
+        page_size: int = 50,
+    ) -> None:
+        self.groups = [f"/aws/lambda/function-{i}" for i in range(lambda_groups)]
+        self.groups += [f"/aws/ecs/service-{i}" for i in range(other_groups)]
+        self.groups.sort()
+        self.filters = {
+            group: ([] if i % unfiltered_every == 0 else [{"filterName": "existing"}])
+            for i, group in enumerate(g for g in self.groups if g.startswith("/aws/lambda/"))
+        }
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.page_size = page_size
+        self.calls = 0
+        self.throttled = 0
+        self._window_start = time.monotonic()
+        self._window_calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, method: str, path: str, headers: dict[str, str], body: bytes) -> tuple:
+        operation = headers["X-Amz-Target"].split(".")[-1]
+        request = json.loads(body or b"{}")
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_calls = now, 0
+            self._window_calls += 1
+            throttled = self._window_calls > self.rate_limit
+            if throttled:
+                self.throttled += 1
+        time.sleep(self.latency)
+        if throttled:
+            return THROTTLED
+        return json_response(getattr(self, operation)(**request), headers={"Content-Type": "application/x-amz-json-1.1"})
+
+    def DescribeLogGroups(self, logGroupNamePrefix: str = "", nextToken: str | None = None, **kwargs) -> dict:
+        matching = [group for group in self.groups if group.startswith(logGroupNamePrefix)]
+        start = int(nextToken or 0)
+        page = {"logGroups": [{"logGroupName": group} for group in matching[start : start + self.page_size]]}
+        if start + self.page_size < len(matching):
+            page["nextToken"] = str(start + self.page_size)
+        return page
+
+    def DescribeSubscriptionFilters(self, logGroupName: str, **kwargs) -> dict:
+        return {"subscriptionFilters": self.filters[logGroupName]}
+
+    def PutSubscriptionFilter(self, logGroupName: str, filterName: str, **kwargs) -> dict:
+        self.filters[logGroupName] = [{"filterName": filterName}]
+        return {}
+
+
+def run(stub_logs: StubLogs, endpoint_url: str, max_workers: int) -> float:
+    # A fresh client per run, so the adaptive rate limiter starts from scratch every time
+    logs_client = create_logs_client(endpoint_url=endpoint_url)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        cw_logs_sub_filter_set(logs_client=logs_client, max_workers=max_workers)
+    elapsed = time.perf_counter() - start
+    assert all(stub_logs.filters.values()), "some log groups were left without a subscription filter"
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the cwLogsEventFilterSet scan through boto3 against a local CloudWatch Logs stub."
+    )
+    parser.add_argument("--lambda-groups", type=int, default=2000)
+    parser.add_argument("--other-groups", type=int, default=3000)
+    parser.add_argument("--unfiltered-every", type=int, default=10, help="Every n-th Lambda group needs a filter.")
+    parser.add_argument("--latency-ms", type=float, default=15.0, help="Simulated latency of one API call.")
+    parser.add_argument("--rate-limit", type=float, default=400.0, help="Calls per second before throttling.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 32])
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        stub_logs = StubLogs(
+            args.lambda_groups, args.other_groups, args.unfiltered_every, args.latency_ms / 1000, args.rate_limit
+        )
+        with StubServer(stub_logs) as stub:
+            elapsed = run(stub_logs, stub.url, workers)
+        print(
+            f"workers={workers:<3} {elapsed:8.2f} s  {stub_logs.calls:6} API calls  "
+            f"{stub_logs.throttled:5} throttled  {stub_logs.calls / elapsed:8.1f} calls/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "github")))
+
+from github_client import GitHubClient, github_headers
+from stub_server import StubServer, json_response
+
+RULESETS = [{"id": 1, "name": "main-protection"}]
+
+
+def route(method: str, path: str, headers: dict[str, str], body: bytes) -> tuple:
+    return json_response(RULESETS)
+
+
+def bench_per_call(base_url: str, requests: int) -> float:
+    """Current approach: module-level `httpx.get` with a fresh headers dict per call."""
+    start = time.perf_counter()
+    for i in range(requests):
+        httpx.get(f"{base_url}/repos/org/repo-{i}/rulesets", headers=github_headers("bench-token"))
+    return requests / (time.perf_counter() - start)
+
+
+def bench_pooled(base_url: str, requests: int) -> float:
+    """Shared keep-alive `GitHubClient`."""
+    with GitHubClient(token="bench-token", base_url=base_url) as client:
+        start = time.perf_counter()
+        for i in range(requests):
+            client.get(f"/repos/org/repo-{i}/rulesets")
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-call httpx requests with the pooled GitHubClient.")
+    parser.add_argument("--requests", type=int, default=2000, help="Number of requests per approach.")
+    args = parser.parse_args()
+
+    with StubServer(route) as server:
+        per_call_rps = bench_per_call(server.url, args.requests)
+        pooled_rps = bench_pooled(server.url, args.requests)
+
+    print(f"per-call httpx.get : {per_call_rps:10.1f} req/s")
+    print(f"pooled GitHubClient: {pooled_rps:10.1f} req/s")
+    print(f"speedup            : {pooled_rps / per_call_rps:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
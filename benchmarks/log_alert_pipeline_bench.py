@@ -0,0 +1,231 @@
+import argparse
+import base64
+import contextlib
+import gzip
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+from stub_server import StubServer
+
+AWS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cloudFunctions", "aws"))
+HANDLER_DIRS = {
+    "cloudwatch": os.path.join(AWS_DIR, "cwLogsEventFilterLambdaSlackNotifier"),
+    "sns": os.path.join(AWS_DIR, "snsLambdaSlackNotifier"),
+}
+DEFAULT_SIZES = (10, 1000, 50000)
+DEFAULT_BASELINES = os.path.join(os.path.dirname(__file__), "baselines", "log_alert_pipeline.json")
+WEBHOOK_SECRET_ID = "bench-slack-webhook"
+
+ERROR_TEMPLATES = (
+    "{time} {request_id} ERROR Task timed out after {seconds}.{millis} seconds",
+    "[ERROR] KeyError: 'user_{number}' Traceback (most recent call last): File /var/task/app.py, line {line}",
+    "{time} {request_id} ERROR Invoke Error {{errorType: ConnectionError, address: 0x{address:x}}}",
+)
+
+
+def cloudwatch_event(events: int, seed: int = 0) -> dict:
+    """Synthetic CloudWatch Logs subscription delivery with `events` error lines from a few recurring templates."""
+    rng = random.Random(seed)
+    log_events = [
+        {
+            "id": str(i),
+            "timestamp": 1700000000000 + i * 10,
+            "message": rng.choice(ERROR_TEMPLATES).format(
+                time="2024-05-01T10:00:00.000Z",
+                request_id=uuid.UUID(int=rng.getrandbits(128)),
+                seconds=rng.randint(1, 900),
+                millis=rng.randint(0, 999),
+                number=rng.randint(0, 10**6),
+                line=rng.randint(1, 500),
+                address=rng.getrandbits(48),
+            ),
+        }
+        for i in range(events)
+    ]
+    payload = {
+        "messageType": "DATA_MESSAGE",
+        "owner": "123456789012",
+        "logGroup": "/aws/lambda/bench-function",
+        "logStream": "2024/05/01/[$LATEST]bench",
+        "subscriptionFilters": ["lambda-error-filter"],
+        "logEvents": log_events,
+    }
+    data = base64.b64encode(gzip.compress(json.dumps(payload).encode("utf-8"))).decode("ascii")
+    return {"awslogs": {"data": data}}
+
+
+def sns_event(records: int, seed: int = 0) -> dict:
+    """Synthetic SNS delivery carrying `records` CloudWatch alarm notifications."""
+    rng = random.Random(seed)
+    return {
+        "Records": [
+            {
+                "EventSource": "aws:sns",
+                "Sns": {
+                    "Type": "Notification",
+                    "MessageId": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "Timestamp": "2024-05-01T10:00:00.000Z",
+                    "Message": json.dumps(
+                        {
+                            "AlarmName": f"bench-alarm-{rng.randint(0, 20)}",
+                            "AWSAccountId": rng.choice(("123456789012", "210987654321")),
+                            "NewStateValue": rng.choice(("ALARM", "OK")),
+                            "NewStateReason": f"Threshold Crossed: 1 datapoint [{rng.random():.3f}] was greater than 0.5",
+                        }
+                    ),
+                },
+            }
+            for _ in range(records)
+        ]
+    }
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_case(pipeline: str, events: int, iterations: int) -> dict:
+    """Run one pipeline in this process (called in a fresh subprocess so peak RSS belongs to the case alone)."""
+    sys.path.insert(0, HANDLER_DIRS[pipeline])
+    import lambda_function
+
+    event = cloudwatch_event(events) if pipeline == "cloudwatch" else sns_event(events)
+    latencies: list[float] = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(iterations):
+            start = time.perf_counter()
+            lambda_function.lambda_handler(event, {})
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        "events": events,
+        "iterations": iterations,
+        "throughput_events_per_second": round(events * iterations / sum(latencies), 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _iterations_for(events: int) -> int:
+    return max(3, min(200, 20000 // events))
+
+
+def regressions(name: str, result: dict, baseline: dict, tolerance: float, min_latency_delta_ms: float) -> list[str]:
+    """Compare a result with its baseline; throughput may drop and latency/RSS may grow by `tolerance` at most.
+
+    Latencies of small deliveries are a few milliseconds, where scheduler noise
+    alone can exceed `tolerance`, so a latency only counts as a regression when
+    it also grew by more than `min_latency_delta_ms`.
+    """
+    found = []
+    if result["throughput_events_per_second"] < baseline["throughput_events_per_second"] / (1 + tolerance):
+        found.append(
+            f"{name}: throughput {result['throughput_events_per_second']} < baseline "
+            f"{baseline['throughput_events_per_second']} events/s"
+        )
+    for metric in ("p50_ms", "p99_ms", "peak_rss_mb"):
+        if result[metric] <= baseline[metric] * (1 + tolerance):
+            continue
+        if metric.endswith("_ms") and result[metric] - baseline[metric] <= min_latency_delta_ms:
+            continue
+        found.append(f"{name}: {metric} {result[metric]} > baseline {baseline[metric]}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the CloudWatch Logs and SNS Slack notifier handlers against a stub Slack webhook."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Events per delivery.")
+    parser.add_argument("--pipelines", nargs="+", default=list(HANDLER_DIRS), choices=list(HANDLER_DIRS))
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES, help="JSON file with the stored baselines.")
+    parser.add_argument("--update-baselines", action="store_true", help="Store this run as the new baselines.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Allowed relative regression before the run fails (0.5 = 50%%)."
+    )
+    parser.add_argument(
+        "--min-latency-delta-ms",
+        type=float,
+        default=5.0,
+        help="Latency growth below this many milliseconds is never reported as a regression.",
+    )
+    parser.add_argument("--run-case", nargs=3, metavar=("PIPELINE", "EVENTS", "ITERATIONS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        pipeline, events, iterations = args.run_case
+        print(json.dumps(run_case(pipeline, int(events), int(iterations))))
+        return
+
+    with StubServer(lambda method, path, headers, body: (200, {}, b"ok")) as slack, tempfile.TemporaryDirectory() as tmp:
+        secrets_path = os.path.join(tmp, "secrets.json")
+        with open(secrets_path, "w", encoding="utf-8") as f:
+            json.dump({WEBHOOK_SECRET_ID: json.dumps(f"{slack.url}/services/bench")}, f)
+        env = {
+            **os.environ,
+            "LOCAL_SECRETS_PATH": secrets_path,
+            "WEBHOOK": WEBHOOK_SECRET_ID,
+            "CHANNEL": "#bench",
+            "USER": "bench",
+        }
+
+        results: dict[str, dict] = {}
+        for pipeline in args.pipelines:
+            for events in args.sizes:
+                name = f"{pipeline}/{events}"
+                output = subprocess.run(
+                    [sys.executable, __file__, "--run-case", pipeline, str(events), str(_iterations_for(events))],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                results[name] = json.loads(output.strip().splitlines()[-1])
+                result = results[name]
+                print(
+                    f"{name:18} {result['throughput_events_per_second']:>12.1f} events/s  "
+                    f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  "
+                    f"peak RSS {result['peak_rss_mb']:>7.1f} MB"
+                )
+        print(f"Slack webhook posts: {slack.request_count}")
+
+    if args.update_baselines:
+        os.makedirs(os.path.dirname(args.baselines), exist_ok=True)
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baselines written to {args.baselines}")
+        return
+
+    try:
+        with open(args.baselines, encoding="utf-8") as f:
+            baselines = json.load(f)
+    except OSError:
+        print(f"No baselines at {args.baselines}; run with --update-baselines to store them")
+        return
+
+    found = [
+        regression
+        for name, result in results.items()
+        if name in baselines
+        for regression in regressions(name, result, baselines[name], args.tolerance, args.min_latency_delta_ms)
+    ]
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    if found:
+        sys.exit(1)
+    print("No regressions against the stored baselines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cloudFunctions", "aws", "shared")))
+
+from notifier import DiscordSink, SlackSink, notify
+from secrets_cache import get_secrets_cache
+from stub_server import StubServer
+
+SLACK_SECRET_ID = "bench-slack-webhook"
+DISCORD_SECRET_ID = "bench-discord-webhook"
+MESSAGE = "Task timed out after 900.00 seconds\n" * 20
+
+
+def legacy_post(webhook: str, message: str) -> None:
+    """Previous slack_notifier approach: hand-built pseudo-JSON and a bare `requests.post` per alert."""
+    payload = "{'channel': '#bench','username': 'bench','text': '" + message + "','icon_emoji': ':catjam:'}"
+    requests.post(webhook, payload)
+
+
+def per_alert_ms(send, alerts: int) -> float:
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(alerts):
+            send()
+    return (time.perf_counter() - start) / alerts * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-alert latency of bare requests.post with the pooled shared notifier."
+    )
+    parser.add_argument("--alerts", type=int, default=500, help="Alerts sent per approach.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated webhook response time.")
+    args = parser.parse_args()
+
+    def route(method: str, path: str, headers: dict[str, str], body: bytes) -> tuple:
+        time.sleep(args.latency_ms / 1000)
+        return 200, {}, b"ok"
+
+    with StubServer(route) as stub, tempfile.TemporaryDirectory() as tmp:
+        slack_url, discord_url = f"{stub.url}/services/bench", f"{stub.url}/api/webhooks/bench"
+        secrets_path = os.path.join(tmp, "secrets.json")
+        with open(secrets_path, "w", encoding="utf-8") as f:
+            json.dump({SLACK_SECRET_ID: json.dumps(slack_url), DISCORD_SECRET_ID: json.dumps(discord_url)}, f)
+        os.environ["LOCAL_SECRETS_PATH"] = secrets_path
+        get_secrets_cache()
+
+        slack = SlackSink(SLACK_SECRET_ID, "#bench", "bench")
+        discord = DiscordSink(DISCORD_SECRET_ID, "bench")
+        results = {
+            "bare requests.post, Slack": per_alert_ms(lambda: legacy_post(slack_url, MESSAGE), args.alerts),
+            "pooled notify, Slack": per_alert_ms(lambda: notify(MESSAGE, [slack]), args.alerts),
+            "bare requests.post, Slack then Discord": per_alert_ms(
+                lambda: (legacy_post(slack_url, MESSAGE), legacy_post(discord_url, MESSAGE)), args.alerts
+            ),
+            "pooled notify, Slack + Discord fan-out": per_alert_ms(
+                lambda: notify(MESSAGE, [slack, discord]), args.alerts
+            ),
+        }
+
+    for name, milliseconds in results.items():
+        print(f"{name:40} {milliseconds:8.3f} ms/alert")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+
+# Every S3 call goes to the local stub below; the credentials only have to exist for request signing
+os.environ["AWS_ACCESS_KEY_ID"] = "bench"
+os.environ["AWS_SECRET_ACCESS_KEY"] = "bench"
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stub_server import StubServer
+from videographyTools.s3_upload import bulk_s3_upload, create_s3_transfer_manager
+
+BUCKET = "bench-bucket"
+MB = 1024 * 1024
+
+
+class StubS3:
+    """Route for `StubServer` answering PutObject and the multipart upload calls, counting the bytes received."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, method: str, path: str, headers: dict[str, str], body: bytes) -> tuple:
+        time.sleep(self.latency)
+        with self._lock:
+            self.bytes_received += len(body)
+        key = path.split("?")[0].split("/", 2)[-1]
+        if method == "POST" and path.endswith("?uploads"):
+            xml = (
+                f"<InitiateMultipartUploadResult><Bucket>{BUCKET}</Bucket><Key>{key}</Key>"
+                f"<UploadId>{uuid.uuid4().hex}</UploadId></InitiateMultipartUploadResult>"
+            )
+            return 200, {"Content-Type": "application/xml"}, xml.encode("utf-8")
+        if method == "POST":
+            xml = (
+                f"<CompleteMultipartUploadResult><Bucket>{BUCKET}</Bucket><Key>{key}</Key>"
+                '<ETag>"bench"</ETag></CompleteMultipartUploadResult>'
+            )
+            return 200, {"Content-Type": "application/xml"}, xml.encode("utf-8")
+        return 200, {"ETag": '"bench"'}, b""
+
+
+def write_files(directory: str, small_files: int, small_kb: int, large_files: int, large_mb: int) -> int:
+    """Write a shoot-like mix of many small and a few large files and return the total size in bytes."""
+    total = 0
+    for i in range(small_files):
+        total += _write(os.path.join(directory, "clips", f"clip-{i:05}.mp4"), small_kb * 1024)
+    for i in range(large_files):
+        total += _write(os.path.join(directory, "masters", f"master-{i:03}.mov"), large_mb * MB)
+    return total
+
+
+def _write(path: str, size: int) -> int:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(os.urandom(min(size, MB)) * (size // MB) + os.urandom(size % MB))
+    return size
+
+
+async def legacy_bulk_upload(directory: str) -> None:
+    """Previous approach: one task per file, a new client per upload and a 16-thread TransferConfig per file."""
+    config = TransferConfig(multipart_threshold=1024 * 8, max_concurrency=16, multipart_chunksize=1024 * 16)
+
+    async def upload(path: str) -> None:
+        key = os.path.relpath(path, directory).replace(os.sep, "/")
+        await asyncio.to_thread(boto3.client("s3").upload_file, Filename=path, Bucket=BUCKET, Key=key, Config=config)
+
+    paths = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+    await asyncio.gather(*(upload(path) for path in paths))
+
+
+def client_threads() -> int:
+    # The stub server's per-connection threads are not part of the uploader's budget
+    return sum("process_request_thread" not in thread.name for thread in threading.enumerate())
+
+
+def measure(run) -> tuple[float, int]:
+    """Run `run()` and return its wall time and the peak number of live uploader threads while it ran."""
+    peak = client_threads()
+    finished = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not finished.wait(0.01):
+            peak = max(peak, client_threads())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        run()
+    elapsed = time.perf_counter() - start
+    finished.set()
+    sampler.join()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the per-file S3 upload approach with the bounded upload scheduler against a local S3 stub."
+    )
+    parser.add_argument("--small-files", type=int, default=400)
+    parser.add_argument("--small-kb", type=int, default=256)
+    parser.add_argument("--large-files", type=int, default=6)
+    parser.add_argument("--large-mb", type=int, default=48)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated latency of one S3 request.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[8, 32, 64], help="Scheduler thread budgets.")
+    parser.add_argument("--files", type=int, default=8, help="Files in flight for the scheduler.")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the scheduler.")
+    args = parser.parse_args()
+
+    stub_s3 = StubS3(args.latency_ms / 1000)
+    with StubServer(stub_s3) as stub, tempfile.TemporaryDirectory() as directory:
+        os.environ["AWS_ENDPOINT_URL_S3"] = stub.url
+        total = write_files(directory, args.small_files, args.small_kb, args.large_files, args.large_mb)
+        print(f"{args.small_files + args.large_files} files, {total / MB:.1f} MB, {args.latency_ms:g} ms per request")
+
+        cases = []
+        if not args.skip_legacy:
+            cases.append(("per-file clients", lambda: asyncio.run(legacy_bulk_upload(directory))))
+        for threads in args.threads:
+
+            def run_scheduler(threads: int = threads) -> None:
+                transfer_manager = create_s3_transfer_manager(max_threads=threads)
+                try:
+                    upload = bulk_s3_upload(
+                        "bench/", BUCKET, directory, max_concurrent_files=args.files, transfer_manager=transfer_manager
+                    )
+                    asyncio.run(upload)
+                finally:
+                    transfer_manager.shutdown()
+
+            cases.append((f"scheduler, {threads} threads", run_scheduler))
+
+        for name, run in cases:
+            received_before, requests_before = stub_s3.bytes_received, stub.request_count
+            elapsed, peak_threads = measure(run)
+            assert stub_s3.bytes_received - received_before >= total, f"{name}: not every byte reached the stub"
+            print(
+                f"{name:26} {elapsed:7.2f} s  {total / MB / elapsed:8.1f} MB/s  "
+                f"{stub.request_count - requests_before:6} requests  peak threads {peak_threads:5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import json
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# (method, path, headers, body) -> (status_code, response_headers, response_body)
+StubRoute = Callable[[str, str, dict[str, str], bytes], tuple[int, dict[str, str], bytes]]
+
+
+def json_response(payload: object, status_code: int = 200, headers: dict[str, str] | None = None) -> tuple:
+    """Build a stub route return value with a JSON encoded body."""
+    response_headers = {"Content-Type": "application/json"}
+    response_headers.update(headers or {})
+    return status_code, response_headers, json.dumps(payload).encode("utf-8")
+
+
+class StubServer:
+    """Local keep-alive HTTP/1.1 server used by the benchmarks in place of GitHub, Slack or Discord.
+
+    Runs a `ThreadingHTTPServer` on a random localhost port in a background
+    thread and hands every request to `route`.
+
+    Args:
+        route: Callable returning (status_code, headers, body) for a request.
+    """
+
+    def __init__(self, route: StubRoute) -> None:
+        self.route = route
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _build_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _dispatch(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with stub._lock:
+                    stub.request_count += 1
+                status_code, headers, payload = stub.route(self.command, self.path, dict(self.headers), body)
+                self.send_response(status_code)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if payload:
+                    self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _dispatch
+
+            def log_message(self, format: str, *args) -> None:
+                return
+
+        return _Handler
+
+    def start(self) -> "StubServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,237 @@
+import os
+import time
+
+from event_data import timestampToDateTime
+from kv_store import DynamoDBTable, JsonFileStore, store_from_env
+
+DEFAULT_WINDOW_SECONDS = 60
+
+
+def new_window(error_obj: dict, now: float) -> dict:
+    """Window opened by an alert that is posted straight away; later alerts in the window are buffered into it."""
+    return {
+        "window_start": now,
+        "account": error_obj["account"],
+        "logStream": error_obj["logStream"],
+        "alerts": 0,
+        "events": 0,
+        "first_timestamp": None,
+        "last_timestamp": None,
+        "sample": None,
+    }
+
+
+def _event_range(error_obj: dict) -> tuple[int, int, int, str]:
+    groups = error_obj["errorLogs"]
+    return (
+        sum(group["count"] for group in groups),
+        min(group["timestamp"] for group in groups),
+        max(group["lastTimestamp"] for group in groups),
+        groups[0]["message"],
+    )
+
+
+class JsonFileAlertWindowStore:
+    """Local stand-in for the alert window table, keeping one window per log group in a JSON file.
+
+    Args:
+        path: Location of the JSON file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = JsonFileStore(path)
+
+    def add(self, log_group: str, error_obj: dict, now: float, window_seconds: float) -> tuple[bool, dict | None]:
+        with self._file.lock:
+            windows = self._file.load()
+            current = windows.get(log_group)
+            if current is None or now - current["window_start"] >= window_seconds:
+                windows[log_group] = new_window(error_obj, now)
+                self._file.save(windows)
+                return True, current
+
+            events, first, last, sample = _event_range(error_obj)
+            current["alerts"] += 1
+            current["events"] += events
+            current["first_timestamp"] = min(current["first_timestamp"] or first, first)
+            current["last_timestamp"] = max(current["last_timestamp"] or last, last)
+            current["sample"] = current["sample"] or sample
+            self._file.save(windows)
+            return False, None
+
+    def pop_expired(self, cutoff: float) -> dict[str, dict]:
+        with self._file.lock:
+            windows = self._file.load()
+            expired = {group: window for group, window in windows.items() if window["window_start"] <= cutoff}
+            for group in expired:
+                del windows[group]
+            self._file.save(windows)
+            return expired
+
+
+class DynamoDBAlertWindowStore:
+    """Keeps one alert window per log group in a DynamoDB table (partition key `logGroup`), shared by all
+    concurrent executions. Opening a window and adding to it are conditional writes, so two invocations
+    never both post the leading alert of the same window.
+
+    Args:
+        table_name: DynamoDB table name.
+    """
+
+    def __init__(self, table_name: str) -> None:
+        self._table = DynamoDBTable(table_name)
+
+    @staticmethod
+    def _decode(item: dict) -> dict:
+        # boto3 returns numbers as Decimal
+        return {
+            key: (
+                float(value)
+                if key == "window_start"
+                else int(value) if key in ("alerts", "events", "first_timestamp", "last_timestamp") else value
+            )
+            for key, value in item.items()
+            if key != "logGroup"
+        }
+
+    def add(self, log_group: str, error_obj: dict, now: float, window_seconds: float) -> tuple[bool, dict | None]:
+        from decimal import Decimal
+
+        key = {"logGroup": log_group}
+        cutoff = Decimal(str(now - window_seconds))
+        events, first, last, sample = _event_range(error_obj)
+        while True:
+            added = self._table.update_if(
+                key,
+                update=(
+                    "ADD alerts :one, events :events "
+                    "SET last_timestamp = if_not_exists(last_timestamp, :last), "
+                    "first_timestamp = if_not_exists(first_timestamp, :first), "
+                    "sample = if_not_exists(sample, :sample)"
+                ),
+                condition="window_start > :cutoff",
+                values={
+                    ":one": 1,
+                    ":events": events,
+                    ":first": first,
+                    ":last": last,
+                    ":sample": sample,
+                    ":cutoff": cutoff,
+                },
+            )
+            if added:
+                # Deliveries can arrive out of order: widen the range like the JSON store's min()/max()
+                condition = "attribute_exists(logGroup) AND :value {} {}"
+                self._table.update_if(
+                    key, "SET first_timestamp = :value", condition.format("<", "first_timestamp"), {":value": first}
+                )
+                self._table.update_if(
+                    key, "SET last_timestamp = :value", condition.format(">", "last_timestamp"), {":value": last}
+                )
+                return False, None
+
+            # No open window (or it expired): open a new one unless another execution just did
+            window = {name: value for name, value in new_window(error_obj, now).items() if value is not None}
+            window["window_start"] = Decimal(str(now))
+            opened, previous = self._table.put_if(
+                {**key, **window},
+                condition="attribute_not_exists(logGroup) OR window_start <= :cutoff",
+                values={":cutoff": cutoff},
+                return_old=True,
+            )
+            if opened:
+                return True, self._decode(previous) if previous else None
+
+    def pop_expired(self, cutoff: float) -> dict[str, dict]:
+        from boto3.dynamodb.conditions import Attr
+        from decimal import Decimal
+
+        expired: dict[str, dict] = {}
+        scan_kwargs = {"FilterExpression": Attr("window_start").lte(Decimal(str(cutoff)))}
+        while True:
+            page = self._table.table.scan(**scan_kwargs)
+            for item in page["Items"]:
+                deleted = self._table.delete_if(
+                    {"logGroup": item["logGroup"]},
+                    condition="window_start = :start",
+                    values={":start": item["window_start"]},
+                )
+                if deleted:
+                    expired[item["logGroup"]] = self._decode(item)
+            if "LastEvaluatedKey" not in page:
+                return expired
+            scan_kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+
+def create_summary_message(log_group: str, window: dict) -> str:
+    return f"""
+=============
+
+|Lambda Error Summary|
+
+Account: {window['account']}
+
+Log Group: <{log_group}>
+
+Log Stream: <{window['logStream']}>
+
+---------------------------------------------
+{window['alerts']} more alert(s) with {window['events']} error log(s) since the last post
+|First|: {timestampToDateTime(window['first_timestamp'])}
+|Last|: {timestampToDateTime(window['last_timestamp'])}
+
+<Sample>: {window['sample']}
+"""
+
+
+class AlertCoalescer:
+    """Coalesces alerts per log group so an error loop posts one summary per window instead of one per delivery.
+
+    The first alert for a log group is posted as usual and opens a window.
+    Alerts for the same group that arrive before the window closes are only
+    counted (deliveries, log events, first/last timestamps and one sample
+    message). The summary is posted by the first alert after the window closes,
+    or by a scheduled `{"coalesce_flush": true}` invocation, whichever is first.
+
+    Args:
+        store: `JsonFileAlertWindowStore` or `DynamoDBAlertWindowStore`.
+        window_seconds: Length of a coalescing window.
+    """
+
+    def __init__(self, store, window_seconds: float = DEFAULT_WINDOW_SECONDS) -> None:
+        self.store = store
+        self.window_seconds = window_seconds
+
+    def add(self, error_obj: dict, now: float | None = None) -> tuple[bool, list[str]]:
+        """Record a delivery, given its grouped errors from `event_data.format_error_logs`.
+
+        Returns:
+            tuple[bool, list[str]]: Whether this alert should be posted now, and summary messages for the
+                window it closed (if any).
+        """
+        if not error_obj["errorLogs"]:
+            # A delivery without log events has nothing to post or count
+            return False, []
+        now = time.time() if now is None else now
+        opened, previous = self.store.add(error_obj["logGroup"], error_obj, now, self.window_seconds)
+        summaries = []
+        if previous is not None and previous["alerts"] > 0:
+            summaries.append(create_summary_message(error_obj["logGroup"], previous))
+        return opened, summaries
+
+    def flush_expired(self, now: float | None = None) -> list[str]:
+        """Close every window older than `window_seconds` and return the summaries of those with buffered alerts."""
+        now = time.time() if now is None else now
+        expired = self.store.pop_expired(now - self.window_seconds)
+        return [create_summary_message(group, window) for group, window in expired.items() if window["alerts"] > 0]
+
+
+def alert_coalescer_from_env() -> AlertCoalescer | None:
+    """Build the coalescer from ALERT_WINDOW_TABLE (DynamoDB) or ALERT_WINDOW_PATH (local JSON file); None disables it.
+
+    The window length comes from ALERT_WINDOW_SECONDS (default 60).
+    """
+    store = store_from_env("ALERT_WINDOW_TABLE", "ALERT_WINDOW_PATH", DynamoDBAlertWindowStore, JsonFileAlertWindowStore)
+    if store is None:
+        return None
+    return AlertCoalescer(store, float(os.getenv("ALERT_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS)))
@@ -0,0 +1,147 @@
+import base64
+import codecs
+import json
+import zlib
+from collections.abc import Iterator
+
+# Base64 characters decoded per step (a multiple of 4 so every slice decodes on its own)
+BASE64_CHUNK_SIZE = 64 * 1024
+# Upper bound on decompressed bytes produced per step
+MAX_DECOMPRESSED_CHUNK_SIZE = 256 * 1024
+_WHITESPACE = " \t\n\r"
+_NUMBER_CONTINUATION = ".eE+-0123456789"
+
+
+def iter_decompressed_text(data: str) -> Iterator[str]:
+    """Base64-decode and gunzip an `awslogs.data` string incrementally, yielding UTF-8 text chunks.
+
+    Only one base64 slice and one bounded decompressed chunk exist at a time,
+    never the whole decompressed document.
+    """
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for start in range(0, len(data), BASE64_CHUNK_SIZE):
+        pending = base64.b64decode(data[start : start + BASE64_CHUNK_SIZE])
+        while pending:
+            chunk = decompressor.decompress(pending, MAX_DECOMPRESSED_CHUNK_SIZE)
+            pending = decompressor.unconsumed_tail
+            if chunk:
+                yield decoder.decode(chunk)
+    tail = decompressor.flush()
+    yield decoder.decode(tail, final=True)
+
+
+class _TextReader:
+    """Sliding window over streamed JSON text that decodes one value at a time and drops what it consumed."""
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        self._chunks = chunks
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+
+    def _fill(self) -> bool:
+        if self._exhausted:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer = self._buffer[self._position :] + chunk
+                self._position = 0
+                return True
+        self._exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                raise ValueError("Unexpected end of awslogs payload")
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise ValueError(f"Expected {character!r} in awslogs payload, got {self.peek()!r}")
+        self._position += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more text until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number (or literal) that reaches the end of the buffer, or stops at a "." / exponent the
+            # buffer has not completed yet, may continue in the next chunk
+            if (
+                not isinstance(value, (dict, list, str))
+                and (end == len(self._buffer) or self._buffer[end] in _NUMBER_CONTINUATION)
+                and self._fill()
+            ):
+                continue
+            self._position = end
+            return value
+
+
+def _iter_array(reader: _TextReader) -> Iterator:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.expect("]")
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ",":
+            reader.expect(",")
+            continue
+        reader.expect("]")
+        return
+
+
+def decode_awslogs(data: str) -> dict:
+    """Decode a CloudWatch Logs subscription payload without materializing the whole document.
+
+    The returned dict holds the top-level fields that precede `logEvents`
+    (CloudWatch sends owner, logGroup and logStream first), and `logEvents` is
+    a generator that parses one event at a time from the decompression
+    stream. Fields that follow `logEvents` are added to the dict once the
+    generator is exhausted.
+
+    Args:
+        data: The `event["awslogs"]["data"]` string (base64-encoded gzip JSON).
+
+    Returns:
+        dict: Payload fields with `logEvents` as an iterator of event dicts.
+    """
+    reader = _TextReader(iter_decompressed_text(data))
+    payload: dict = {"logEvents": iter(())}
+
+    def read_members() -> Iterator:
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+            if key == "logEvents":
+                yield from _iter_array(reader)
+            else:
+                payload[key] = reader.value()
+            if reader.peek() == ",":
+                reader.expect(",")
+        reader.expect("}")
+
+    reader.expect("{")
+    members = read_members()
+    # Read the header fields eagerly, then stop at the first event and hand the rest over as a generator
+    for first_event in members:
+
+        def events(first_event=first_event) -> Iterator[dict]:
+            yield first_event
+            yield from members
+
+        payload["logEvents"] = events()
+        break
+    return payload
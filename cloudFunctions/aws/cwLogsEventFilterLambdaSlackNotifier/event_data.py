@@ -1,5 +1,13 @@
-import json
 import datetime
+import re
+
+# Volatile parts of a log line; masking them makes repeats of the same error share one fingerprint
+FINGERPRINT_PATTERN = re.compile(
+    r"(?P<uuid>\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b)"
+    r"|(?P<timestamp>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)"
+    r"|(?P<hex>\b0x[0-9a-fA-F]+\b)"
+    r"|(?P<number>\d+(?:\.\d+)?)"
+)
 
 
 def timestampToDateTime(timestamp: str) -> str:
@@ -11,31 +19,66 @@ def timestampToDateTime(timestamp: str) -> str:
     return date_string
 
 
+def fingerprint_message(message: str) -> str:
+    """Mask UUIDs, timestamps, hex addresses and numbers so repeats of one error map to the same string."""
+    return FINGERPRINT_PATTERN.sub(lambda match: f"<{match.lastgroup}>", message)
+
+
+# Characters the Slack payload cannot carry as-is, removed in one pass
+SANITIZE_TABLE = str.maketrans({"/": None, "\\": None, "'": None, '"': None, "\xa0": None})
+# Slack truncates long messages; alerts are split into chunks of at most this many characters
+MAX_SLACK_MESSAGE_LENGTH = 4000
+
+
+def sanitize_message(message: str) -> str:
+    return message.translate(SANITIZE_TABLE)
+
+
 def format_error_logs(error_logs: dict) -> dict:
+    """Group the log events of a CloudWatch Logs payload by fingerprint.
+
+    `error_logs["logEvents"]` may be a list or a one-shot iterator (see
+    `awslogs_stream.decode_awslogs`); it is consumed once and only the first
+    message of each group is kept.
+    """
+    # One entry per fingerprint, in order of first occurrence
+    groups = {}
+
+    for log in error_logs["logEvents"]:
+        fingerprint = fingerprint_message(log["message"])
+        group = groups.get(fingerprint)
+        if group is not None:
+            group["count"] += 1
+            group["lastTimestamp"] = max(group["lastTimestamp"], log["timestamp"])
+            continue
+
+        groups[fingerprint] = {
+            "timestamp": log["timestamp"],
+            "lastTimestamp": log["timestamp"],
+            "message": sanitize_message(log["message"]),
+            "count": 1,
+        }
+
+    # Read after the events: with a streamed payload, fields sent after logEvents are only known now
     error_obj = {
         "account": error_logs["owner"],
         "logGroup": error_logs["logGroup"],
         "logStream": error_logs["logStream"],
     }
-    errors = []
-
-    for log in error_logs["logEvents"]:
-        time = timestampToDateTime(log["timestamp"])
-        message = log["message"].replace("/", "")
-        message = message.replace("\\", "")
-        message = message.replace("'", "")
-        message = message.replace('"', "")
-        message = message.replace("\xa0", "")
-
-        time_log = {"time": time, "message": message}
-        errors.append(time_log)
-    error_obj["errorLogs"] = errors
+    error_obj["errorLogs"] = [
+        {
+            "time": timestampToDateTime(group["timestamp"]),
+            "lastTime": timestampToDateTime(group["lastTimestamp"]),
+            **group,
+        }
+        for group in groups.values()
+    ]
 
     return error_obj
 
 
-def create_error_message(error_obj: dict) -> str:
-    error_message = f"""
+def _error_header(error_obj: dict) -> str:
+    return f"""
 =============
 
 |Lambda Error|
@@ -49,22 +92,46 @@ Log Stream: <{error_obj['logStream']}>
 ---------------------------------------------
 Logs:
     """
-    for log in error_obj["errorLogs"]:
-        print(log["message"])
 
-        error_message += f"""
+
+def _error_entry(log: dict) -> str:
+    if log["count"] > 1:
+        occurrences = f"|Occurrences|: {log['count']} (last at {log['lastTime']})\n"
+    else:
+        occurrences = ""
+
+    return f"""
 !
 |Time|: {log['time']}
-
+{occurrences}
 <Error>: {log['message']}
 
 """
 
-    return error_message
 
+def create_error_messages(error_obj: dict, max_length: int = MAX_SLACK_MESSAGE_LENGTH) -> list[str]:
+    """Build the Slack text for an error payload, split at log entry boundaries into chunks of at most `max_length`.
 
-def error_main(error_logs: dict) -> str:
-    error_obj = format_error_logs(error_logs=error_logs)
-    error_message = create_error_message(error_obj=error_obj)
+    Every chunk starts with the account/log group header. Parts are collected in
+    lists and joined once per chunk; a single entry longer than a chunk is truncated.
+    """
+    header = _error_header(error_obj)
+    entry_limit = max_length - len(header)
+    messages = []
+    parts = [header]
+    length = len(header)
+
+    for log in error_obj["errorLogs"]:
+        entry = _error_entry(log)
+        if len(entry) > entry_limit:
+            entry = entry[: entry_limit - 4] + "...\n"
+        if length + len(entry) > max_length:
+            messages.append("".join(parts))
+            parts = [header]
+            length = len(header)
+        parts.append(entry)
+        length += len(entry)
+
+    messages.append("".join(parts))
+    return messages
 
-    return error_message
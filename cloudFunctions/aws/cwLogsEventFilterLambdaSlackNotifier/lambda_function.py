@@ -1,24 +1,56 @@
-import json
-import base64
-import gzip
-from boto3 import client
+import os
+import sys
 
-from slack_notifier import slack_notifier
-from event_data import error_main
+# Shared modules from cloudFunctions/aws/shared and github/, copied next to this module by the Dockerfile (local runs use the repo paths)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shared")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "github")))
 
-sm = client(service_name="secretsmanager")
+from notifier import notify
+from event_data import create_error_messages, format_error_logs
+from alert_coalescing import alert_coalescer_from_env
+from awslogs_stream import decode_awslogs
+
+# Module scope so the store client is reused across warm invocations
+coalescer = alert_coalescer_from_env()
+
+
+def handler_result(summaries_sent: int = 0, messages_sent: int = 0, buffered: bool = False) -> dict:
+    """Response returned by every path of the handler."""
+    return {"buffered": buffered, "summaries_sent": summaries_sent, "messages_sent": messages_sent}
 
 
 def lambda_handler(event, context):
 
-    print(event)
-    log = event["awslogs"]["data"]
-    log_data_compressed = base64.b64decode(log)
-    log_data_decompressed = gzip.decompress(log_data_compressed)
-    log_data_str = log_data_decompressed.decode("utf-8")
-
-    error_logs = json.loads(log_data_str)
-    print(error_logs)
-    error_message = error_main(error_logs=error_logs)
-    print(error_message)
-    slack_notifier(error_message)
+    if event.get("coalesce_flush"):
+        print(event)
+        if coalescer is None:
+            print("Alert coalescing is disabled (no ALERT_WINDOW_TABLE or ALERT_WINDOW_PATH); nothing to flush")
+            return handler_result()
+        # Scheduled invocation: post summaries for windows that closed without a later alert
+        summaries = coalescer.flush_expired()
+        for summary in summaries:
+            notify(summary)
+        return handler_result(summaries_sent=len(summaries))
+
+    # Events are decompressed and parsed one at a time and grouped as they stream in,
+    # so neither the decompressed payload nor the raw event list is ever held in full
+    error_logs = decode_awslogs(event["awslogs"]["data"])
+    error_obj = format_error_logs(error_logs=error_logs)
+    event_count = sum(log["count"] for log in error_obj["errorLogs"])
+    print(f"{error_obj['logGroup']}: {event_count} error log(s) in {len(error_obj['errorLogs'])} group(s)")
+    if not error_obj["errorLogs"]:
+        return handler_result()
+
+    summaries = []
+    if coalescer is not None:
+        post_now, summaries = coalescer.add(error_obj)
+        for summary in summaries:
+            notify(summary)
+        if not post_now:
+            print(f"Alert for {error_obj['logGroup']} buffered into the current window")
+            return handler_result(summaries_sent=len(summaries), buffered=True)
+
+    error_messages = create_error_messages(error_obj=error_obj)
+    for error_message in error_messages:
+        notify(error_message)
+    return handler_result(summaries_sent=len(summaries), messages_sent=len(error_messages))
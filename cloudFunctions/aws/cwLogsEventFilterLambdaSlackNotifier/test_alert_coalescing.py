@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shared")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "github")))
+
+from alert_coalescing import AlertCoalescer, JsonFileAlertWindowStore
+
+
+def error_obj(*timestamps: int) -> dict:
+    return {
+        "account": "111111111111",
+        "logGroup": "/aws/lambda/loop",
+        "logStream": "2026/10/18/[$LATEST]abc",
+        "errorLogs": [
+            {"timestamp": timestamp, "lastTimestamp": timestamp, "message": "Task timed out", "count": 1}
+            for timestamp in timestamps
+        ],
+    }
+
+
+def test_delivery_without_log_events_is_ignored(tmp_path):
+    coalescer = AlertCoalescer(JsonFileAlertWindowStore(str(tmp_path / "windows.json")), window_seconds=60)
+
+    assert coalescer.add(error_obj(), now=0) == (False, [])
+    assert coalescer.add(error_obj(1000), now=1) == (True, [])
+    # With a window open, an empty delivery is neither counted nor raises
+    assert coalescer.add(error_obj(), now=2) == (False, [])
+    assert coalescer.add(error_obj(2000), now=3) == (False, [])
+
+    summaries = coalescer.flush_expired(now=100)
+
+    assert len(summaries) == 1
+    assert "1 more alert(s) with 1 error log(s)" in summaries[0]
@@ -0,0 +1,89 @@
+import base64
+import gzip
+import json
+import random
+
+import awslogs_stream
+from awslogs_stream import decode_awslogs
+
+MESSAGES = (
+    "2026-10-18T10:00:00.000Z 1b4f ERROR Task timed out after 900.00 seconds",
+    'ERROR KeyError: \'user_42\' in {"path": "C:\\\\tmp\\\\x", "quote": "\\""}',
+    "ERROR line one\nline two\ttabbed\r\n",
+    "ERROR café naïve Ωmega 日本語 🚨 failure",
+    "ERROR \u0000 control \u001f and \\u escapes",
+)
+
+
+def payload(events: int = 12) -> dict:
+    return {
+        "messageType": "DATA_MESSAGE",
+        "owner": "111111111111",
+        "logGroup": "/aws/lambda/streaming-é",
+        "logStream": "2026/10/18/[$LATEST]abc",
+        "subscriptionFilters": ["lambda-error-filter"],
+        "logEvents": [
+            {"id": str(i), "timestamp": 1760781600000 + i, "message": MESSAGES[i % len(MESSAGES)]}
+            for i in range(events)
+        ],
+        # Fields after logEvents, including numbers that can be split mid-token
+        "ratio": -1.25e-3,
+        "retries": 12345,
+        "truncated": False,
+        "extra": None,
+    }
+
+
+def encode(document: dict, ensure_ascii: bool) -> str:
+    text = json.dumps(document, ensure_ascii=ensure_ascii)
+    return base64.b64encode(gzip.compress(text.encode("utf-8"))).decode("ascii")
+
+
+def materialize(data: str) -> dict:
+    decoded = decode_awslogs(data)
+    events = list(decoded["logEvents"])
+    return {**decoded, "logEvents": events}
+
+
+def expected(data: str) -> dict:
+    return json.loads(gzip.decompress(base64.b64decode(data)))
+
+
+def test_matches_json_loads_for_every_chunk_size(monkeypatch):
+    for ensure_ascii in (True, False):
+        data = encode(payload(), ensure_ascii=ensure_ascii)
+        for base64_chunk_size in (4, 8, 12, 100, 4096):
+            for decompressed_chunk_size in (1, 2, 3, 7, 64):
+                monkeypatch.setattr(awslogs_stream, "BASE64_CHUNK_SIZE", base64_chunk_size)
+                monkeypatch.setattr(awslogs_stream, "MAX_DECOMPRESSED_CHUNK_SIZE", decompressed_chunk_size)
+
+                assert materialize(data) == expected(data)
+
+
+def test_matches_json_loads_for_arbitrary_text_splits(monkeypatch):
+    rng = random.Random(0)
+    for ensure_ascii in (True, False):
+        data = encode(payload(), ensure_ascii=ensure_ascii)
+        text = gzip.decompress(base64.b64decode(data)).decode("utf-8")
+        for _ in range(50):
+            cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 40)))
+            chunks = [text[start:end] for start, end in zip([0, *cuts], [*cuts, len(text)])]
+            monkeypatch.setattr(awslogs_stream, "iter_decompressed_text", lambda _data, chunks=chunks: iter(chunks))
+
+            assert materialize(data) == expected(data)
+
+
+def test_every_single_split_point(monkeypatch):
+    data = encode(payload(events=3), ensure_ascii=False)
+    text = gzip.decompress(base64.b64decode(data)).decode("utf-8")
+    for cut in range(1, len(text)):
+        monkeypatch.setattr(awslogs_stream, "iter_decompressed_text", lambda _data, cut=cut: iter([text[:cut], text[cut:]]))
+
+        assert materialize(data) == expected(data)
+
+
+def test_empty_log_events():
+    document = payload(events=0)
+    data = encode(document, ensure_ascii=True)
+
+    assert materialize(data) == document
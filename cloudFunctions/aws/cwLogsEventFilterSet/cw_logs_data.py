@@ -1,48 +1,96 @@
 import boto3
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-client = boto3.client("logs")
+from botocore.config import Config
 
+MAX_WORKERS = int(os.getenv("FILTER_SCAN_CONCURRENCY", "16"))
+# Attempts per call, including the first, before botocore gives up on a throttled or failed call
+MAX_ATTEMPTS = int(os.getenv("LOGS_MAX_ATTEMPTS", "8"))
+LOG_GROUP_PREFIX = "/aws/lambda/"
+FILTER_NAME = "lambda-error-filter"
+FILTER_PATTERN = "%ERROR%"
 
-def get_log_groups() -> list[str]:
-    log_groups = client.describe_log_groups()
-    log_group_names = []
+# botocore's adaptive retry mode owns all backoff: it retries ThrottlingException with exponential backoff and
+# rate-limits the sends of every thread sharing this client once throttling starts.
+# The connection pool has to be at least as large as the thread pool, or threads queue for connections.
+LOGS_CLIENT_CONFIG = Config(
+    max_pool_connections=max(10, MAX_WORKERS), retries={"mode": "adaptive", "total_max_attempts": MAX_ATTEMPTS}
+)
+
+
+def create_logs_client(**kwargs):
+    """Create a CloudWatch Logs client with the shared retry and pool settings (kwargs go to `boto3.client`)."""
+    return boto3.client("logs", config=LOGS_CLIENT_CONFIG, **kwargs)
+
+
+client = create_logs_client()
 
-    while "nextToken" in log_groups.keys():
-        for group in log_groups["logGroups"]:
-            if "lambda/" in group["logGroupName"]:
-                log_group_names.append(group["logGroupName"])
-        log_groups = client.describe_log_groups(nextToken=log_groups["nextToken"])
 
-    for group in log_groups["logGroups"]:
-        if "lambda/" in group["logGroupName"]:
+class RetryCounter:
+    """Counts the retries botocore made for the calls of one run, read from each response's `RetryAttempts`."""
+
+    def __init__(self) -> None:
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def call(self, operation, **kwargs) -> dict:
+        response = operation(**kwargs)
+        with self._lock:
+            self.retries += response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        return response
+
+
+def get_log_groups(logs_client=None) -> list[str]:
+    """List Lambda log groups; the `/aws/lambda/` prefix is filtered by CloudWatch Logs, not client side."""
+    paginator = (logs_client or client).get_paginator("describe_log_groups")
+    log_group_names = []
+    for page in paginator.paginate(logGroupNamePrefix=LOG_GROUP_PREFIX):
+        for group in page["logGroups"]:
             log_group_names.append(group["logGroupName"])
 
     return log_group_names
 
 
-def get_log_filters(log_groups_names: list[str]) -> dict:
+def get_log_filters(
+    log_groups_names: list[str],
+    logs_client=None,
+    max_workers: int = MAX_WORKERS,
+    retries: RetryCounter | None = None,
+) -> dict:
+    """Look up subscription filters for every group concurrently and return the groups that have none."""
+    logs_client = logs_client or client
+    retries = retries or RetryCounter()
+
+    def describe(group: str) -> dict:
+        return retries.call(logs_client.describe_subscription_filters, logGroupName=group)
+
     log_groups = {}
-    for group in log_groups_names:
-        group_sub_filters = client.describe_subscription_filters(
-            logGroupName=group,
-        )
-        if not group_sub_filters["subscriptionFilters"]:
-            log_groups[group] = group_sub_filters
-
-    print(log_groups)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for group, group_sub_filters in zip(log_groups_names, executor.map(describe, log_groups_names)):
+            if not group_sub_filters["subscriptionFilters"]:
+                log_groups[group] = group_sub_filters
+
+    print(f"{len(log_groups)} of {len(log_groups_names)} log groups have no subscription filter")
     return log_groups
 
 
-def add_subscripton_filters(log_groups: dict):
+def add_subscripton_filters(
+    log_groups: dict, logs_client=None, max_workers: int = MAX_WORKERS, retries: RetryCounter | None = None
+):
     print(f"=== {os.environ['LAMBDAARN']} ===")
-    for group in log_groups:
+    logs_client = logs_client or client
+    retries = retries or RetryCounter()
+
+    def apply(group: str) -> None:
         try:
             print(f"Applying error filter to : {group}")
-            response = client.put_subscription_filter(
+            response = retries.call(
+                logs_client.put_subscription_filter,
                 logGroupName=group,
-                filterName="lambda-error-filter",
-                filterPattern="%ERROR%",
+                filterName=FILTER_NAME,
+                filterPattern=FILTER_PATTERN,
                 destinationArn=os.environ["LAMBDAARN"],
             )
             print(response)
@@ -50,8 +98,35 @@ def add_subscripton_filters(log_groups: dict):
             print(f"This went wrong while applying filter to: {group}")
             print(e)
 
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(apply, log_groups))
+
+
+def attach_error_filter(log_group_name: str, logs_client=None) -> bool:
+    """Attach the error filter to a single log group, e.g. one that was just created.
+
+    Returns:
+        bool: True if the filter was put, False if the group is outside the Lambda log group prefix.
+    """
+    if not log_group_name.startswith(LOG_GROUP_PREFIX):
+        print(f"Skipping {log_group_name}: not a Lambda log group")
+        return False
+
+    print(f"Applying error filter to new log group: {log_group_name}")
+    (logs_client or client).put_subscription_filter(
+        logGroupName=log_group_name,
+        filterName=FILTER_NAME,
+        filterPattern=FILTER_PATTERN,
+        destinationArn=os.environ["LAMBDAARN"],
+    )
+    return True
+
 
-def cw_logs_sub_filter_set():
-    log_groups_names = get_log_groups()
-    log_groups = get_log_filters(log_groups_names=log_groups_names)
-    add_subscripton_filters(log_groups=log_groups)
+def cw_logs_sub_filter_set(logs_client=None, max_workers: int = MAX_WORKERS):
+    retries = RetryCounter()
+    log_groups_names = get_log_groups(logs_client=logs_client)
+    log_groups = get_log_filters(
+        log_groups_names=log_groups_names, logs_client=logs_client, max_workers=max_workers, retries=retries
+    )
+    add_subscripton_filters(log_groups=log_groups, logs_client=logs_client, max_workers=max_workers, retries=retries)
+    print(f"API call retries (throttling and transient errors): {retries.retries}")
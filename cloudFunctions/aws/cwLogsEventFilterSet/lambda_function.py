@@ -1,9 +1,30 @@
-from cw_logs_data import cw_logs_sub_filter_set
+from cw_logs_data import attach_error_filter, cw_logs_sub_filter_set
+
+
+def created_log_group_name(event: dict) -> str | None:
+    """Return the log group name of a CloudTrail `CreateLogGroup` event delivered by EventBridge, else None.
+
+    EventBridge rule pattern:
+        {"source": ["aws.logs"], "detail-type": ["AWS API Call via CloudTrail"],
+         "detail": {"eventSource": ["logs.amazonaws.com"], "eventName": ["CreateLogGroup"]}}
+    """
+    detail = (event or {}).get("detail") or {}
+    if detail.get("eventName") != "CreateLogGroup":
+        return None
+    return (detail.get("requestParameters") or {}).get("logGroupName")
 
 
 def lambda_handler(event, context):
+    log_group_name = created_log_group_name(event)
+    if log_group_name:
+        # Event-driven path: cover the new group right away without scanning the account
+        attached = attach_error_filter(log_group_name)
+        return {"mode": "event", "logGroupName": log_group_name, "attached": attached}
+
+    # Anything else (e.g. the schedule) runs the full reconciliation sweep for groups the events missed
     print("Start Assessment")
     print("===")
     cw_logs_sub_filter_set()
     print("===")
     print("Finished Assessment")
+    return {"mode": "sweep"}
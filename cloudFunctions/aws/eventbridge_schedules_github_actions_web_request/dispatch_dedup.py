@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import time
+
+from kv_store import DynamoDBTable, JsonFileStore, store_from_env
+
+DEFAULT_DEBOUNCE_SECONDS = 60
+
+
+def dispatch_key(target: dict) -> str:
+    """Idempotency key of a dispatch: repository, workflow, ref and a hash of the inputs."""
+    inputs_hash = hashlib.sha256(json.dumps(target.get("inputs") or {}, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{target['owner']}/{target['repo']}:{target['workflow']}@{target['ref']}#{inputs_hash[:16]}"
+
+
+class JsonFileDispatchStore:
+    """Local stand-in for the dispatch table, keeping the last dispatch time per key in a JSON file.
+
+    Args:
+        path: Location of the JSON file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = JsonFileStore(path)
+
+    def claim(self, key: str, now: float, window_seconds: float) -> bool:
+        with self._file.lock:
+            claims = self._file.load()
+            if key in claims and now - claims[key] < window_seconds:
+                return False
+            # Expired claims are dropped on every write so the file only holds the current window
+            claims = {k: claimed_at for k, claimed_at in claims.items() if now - claimed_at < window_seconds}
+            claims[key] = now
+            self._file.save(claims)
+            return True
+
+    def release(self, key: str, claimed_at: float) -> None:
+        with self._file.lock:
+            claims = self._file.load()
+            if claims.get(key) == claimed_at:
+                del claims[key]
+                self._file.save(claims)
+
+
+class DynamoDBDispatchStore:
+    """Keeps the last dispatch time per key in a DynamoDB table (partition key `dispatchKey`), shared by all
+    concurrent executions. Claiming is a conditional write, so two overlapping invocations never both
+    dispatch the same workflow. `expires_at` is written for the table's TTL setting.
+
+    Args:
+        table_name: DynamoDB table name.
+    """
+
+    def __init__(self, table_name: str) -> None:
+        self._table = DynamoDBTable(table_name)
+
+    def claim(self, key: str, now: float, window_seconds: float) -> bool:
+        from decimal import Decimal
+
+        claimed, _ = self._table.put_if(
+            {"dispatchKey": key, "claimed_at": Decimal(str(now)), "expires_at": int(now + window_seconds)},
+            condition="attribute_not_exists(dispatchKey) OR claimed_at <= :cutoff",
+            values={":cutoff": Decimal(str(now - window_seconds))},
+        )
+        return claimed
+
+    def release(self, key: str, claimed_at: float) -> None:
+        from decimal import Decimal
+
+        self._table.delete_if(
+            {"dispatchKey": key}, condition="claimed_at = :claimed_at", values={":claimed_at": Decimal(str(claimed_at))}
+        )
+
+
+class DispatchDebouncer:
+    """Skips workflow dispatches that repeat one sent within the debounce window.
+
+    A dispatch is claimed before it is sent, so EventBridge retries and
+    overlapping schedules racing for the same key see the claim and skip.
+    When the dispatch then fails the claim is released, so the next attempt
+    is not blocked by a run that never started.
+
+    Args:
+        store: `JsonFileDispatchStore` or `DynamoDBDispatchStore`.
+        window_seconds: Length of the debounce window.
+    """
+
+    def __init__(self, store, window_seconds: float = DEFAULT_DEBOUNCE_SECONDS) -> None:
+        self.store = store
+        self.window_seconds = window_seconds
+
+    def claim(self, target: dict, now: float | None = None) -> float | None:
+        """Claim a target for dispatch.
+
+        Returns:
+            float | None: The claim time to pass to `release()`, or None when the target was dispatched within
+                the window and should be skipped.
+        """
+        now = time.time() if now is None else now
+        if not self.store.claim(dispatch_key(target), now, self.window_seconds):
+            return None
+        return now
+
+    def release(self, target: dict, claimed_at: float) -> None:
+        """Give up a claim whose dispatch failed."""
+        self.store.release(dispatch_key(target), claimed_at)
+
+
+def dispatch_debouncer_from_env() -> DispatchDebouncer | None:
+    """Build the debouncer from DISPATCH_DEDUP_TABLE (DynamoDB) or DISPATCH_DEDUP_PATH (local JSON file);
+    None disables it.
+
+    The window length comes from DISPATCH_DEBOUNCE_SECONDS (default 60).
+    """
+    store = store_from_env("DISPATCH_DEDUP_TABLE", "DISPATCH_DEDUP_PATH", DynamoDBDispatchStore, JsonFileDispatchStore)
+    if store is None:
+        return None
+    return DispatchDebouncer(store, float(os.getenv("DISPATCH_DEBOUNCE_SECONDS", DEFAULT_DEBOUNCE_SECONDS)))
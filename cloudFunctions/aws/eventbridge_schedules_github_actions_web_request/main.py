@@ -1,88 +1,182 @@
+import asyncio
 import httpx
-import json
 import os
+import sys
 
-import boto3
+# Local runs import the shared modules from github/ and cloudFunctions/aws/shared; in the image they sit next to main.py
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "github")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shared")))
 
+from dispatch_dedup import dispatch_debouncer_from_env
+from github_client import GITHUB_API_URL, AsyncGitHubClient
+from secrets_cache import get_secret, get_secrets_cache
 
-sm = boto3.client("secretsmanager")
+# Upper bound on workflow dispatches in flight at once for a multi-target event
+DISPATCH_CONCURRENCY = int(os.getenv("DISPATCH_CONCURRENCY", "8"))
 
+# Module scope so the store client is reused across warm invocations
+debouncer = dispatch_debouncer_from_env()
 
-def load_secrets_manager_environment_variables() -> bool:  # TODO Add this into base image for all Lambda functions
+# Keys dispatch_target() adds to a result; left out of the single-target response body
+TARGET_KEYS = ("owner", "repo", "workflow", "ref", "inputs")
+
+
+def load_secrets_manager_environment_variables(force_refresh: bool = False) -> bool:
+    # Served from the warm-invocation secrets cache; force_refresh re-reads Secrets Manager (e.g. after a 401)
     try:
         print("Loading secrets manager environment variables")
-        secret_variables: dict[str, str] = json.loads(
-            sm.get_secret_value(SecretId=os.getenv("SECRET_ARN"))["SecretString"]
-        )
+        secret_variables: dict[str, str] = get_secret(os.getenv("SECRET_ARN"), force_refresh=force_refresh)
         for secret_variable in secret_variables:
             os.environ[secret_variable] = secret_variables[secret_variable]
-        print("Secrets manager environment variables loaded")
+        print(f"Secrets manager environment variables loaded (secrets cache: {get_secrets_cache().stats()})")
         return True
     except Exception as e:
         print(f"Error loading secrets manager environment variables: {e}")
         return False
 
 
-def trigger_github_workflow_dispatch(
-    owner: str, repo: str, workflow_id: str, github_token: str, ref: str = "main", inputs: dict | None = None
-) -> dict:
-    """Trigger a GitHub Actions workflow_dispatch event via the GitHub REST API.
+def dispatch_result(response: httpx.Response) -> dict:
+    """Build the result dictionary returned for a workflow_dispatch response (204 means it was triggered)."""
+    if response.status_code == 204:
+        return {
+            "status_code": response.status_code,
+            "message": "Workflow dispatch triggered successfully",
+            "success": True,
+        }
+    return {
+        "status_code": response.status_code,
+        "message": f"Error: {response.text}",
+        "success": False,
+        "response_body": response.text,
+    }
 
-    This function makes an HTTP POST request to GitHub's API to trigger a workflow_dispatch event,
-    which manually starts a GitHub Actions workflow. The target workflow must have `workflow_dispatch`
-    defined in its trigger configuration.
 
-    Note: If the target workflow's `workflow_dispatch` trigger doesn't define inputs, passing inputs
-    will result in a 422 error. Only include inputs if the workflow explicitly defines them under
-    `workflow_dispatch.inputs`.
+def dispatch_target(target: dict) -> dict:
+    """Normalize one dispatch target from the event, filling missing fields from the environment defaults.
 
     Args:
-        owner: Repository owner (e.g., 'scondo-prof')
-        repo: Repository name (e.g., 'the_ticketing_system')
-        workflow_id: Workflow file name (e.g., 'github-issues-discord-integration.yml')
-        github_token: GitHub Personal Access Token with 'actions:write' permission
-        ref: Branch or tag name to trigger the workflow from (default: 'main')
-        inputs: Optional workflow inputs dictionary. Only use if the workflow defines inputs under
-                `workflow_dispatch`. If None or empty, no inputs will be sent.
+        target: Dictionary with optional `owner`, `repo`, `workflow`, `ref` and `inputs` keys.
 
     Returns:
-        dict: Response dictionary containing:
-            - status_code (int): HTTP status code from GitHub API
-            - message (str): Human-readable message about the result
-            - success (bool): True if workflow was triggered successfully (204 status)
-            - response_body (str, optional): Error response body if request failed
+        dict: Target with all five keys set.
     """
-    url = f"https://api.github.com/repos/{owner}/{repo}/actions/workflows/{workflow_id}/dispatches"
+    return {
+        "owner": target.get("owner") or os.environ.get("GITHUB_OWNER", "scondo-prof"),
+        "repo": target.get("repo") or os.environ.get("GITHUB_REPO", "the_ticketing_system"),
+        "workflow": (
+            target.get("workflow") or os.environ.get("GITHUB_WORKFLOW", "github-issues-discord-integration.yml")
+        ),
+        "ref": target.get("ref") or os.environ.get("GITHUB_BRANCH", "main"),
+        "inputs": target.get("inputs") or None,
+    }
+
+
+async def dispatch_workflows(
+    targets: list[dict],
+    github_token: str,
+    max_concurrency: int = DISPATCH_CONCURRENCY,
+    base_url: str = GITHUB_API_URL,
+) -> list[dict]:
+    """Trigger workflow_dispatch for every target concurrently over one pooled `AsyncGitHubClient`.
 
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {github_token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-        "Content-Type": "application/json",
+    At most `max_concurrency` dispatches are in flight at once, and every
+    request is paced by the shared rate-limit governor for the token, so the
+    run takes about as long as the slowest dispatch rather than the sum of
+    them. A failing target never stops the others.
+
+    The target workflows must define a `workflow_dispatch` trigger. Inputs are
+    only sent when a target has them; a workflow that does not declare them
+    under `workflow_dispatch.inputs` answers 422.
+
+    Args:
+        targets: Normalized targets from `dispatch_target()`.
+        github_token: GitHub Personal Access Token with 'actions:write' permission.
+        max_concurrency: Upper bound on dispatches in flight.
+        base_url: GitHub API root.
+
+    Returns:
+        list[dict]: One result per target, in target order: the target fields plus the
+            `dispatch_result()` keys (`status_code`, `message`, `success` and, on failure, `response_body`).
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def dispatch(client: AsyncGitHubClient, target: dict) -> dict:
+        url = f"/repos/{target['owner']}/{target['repo']}/actions/workflows/{target['workflow']}/dispatches"
+        payload = {"ref": target["ref"]}
+        if target["inputs"]:
+            payload["inputs"] = target["inputs"]
+        async with semaphore:
+            try:
+                result = dispatch_result(await client.post(url, json=payload, timeout=30.0))
+            except httpx.RequestError as e:
+                result = {"status_code": 500, "message": f"Request error: {str(e)}", "success": False}
+        return {**target, **result}
+
+    async with AsyncGitHubClient(token=github_token, base_url=base_url) as client:
+        return list(await asyncio.gather(*(dispatch(client, target) for target in targets)))
+
+
+def skipped_result(target: dict) -> dict:
+    """Result reported for a target that was already dispatched within the debounce window."""
+    return {
+        **target,
+        "status_code": 208,
+        "message": f"Skipped: already dispatched within the last {debouncer.window_seconds:g} seconds",
+        "success": True,
+        "skipped": True,
     }
 
-    payload = {"ref": ref}
-    if inputs:
-        payload["inputs"] = inputs
 
-    try:
-        response = httpx.post(url, headers=headers, json=payload, timeout=30.0)
-
-        if response.status_code == 204:
-            return {
-                "status_code": response.status_code,
-                "message": "Workflow dispatch triggered successfully",
-                "success": True,
-            }
-        else:
-            return {
-                "status_code": response.status_code,
-                "message": f"Error: {response.text}",
-                "success": False,
-                "response_body": response.text,
-            }
-    except httpx.RequestError as e:
-        return {"status_code": 500, "message": f"Request error: {str(e)}", "success": False}
+def dispatch_many(event_targets: list[dict]) -> dict:
+    """Dispatch every target of an event and report a result per target.
+
+    Every event goes through here; a single-target event is a one-element list.
+
+    Targets rejected with 401 are retried once after the secret is re-read, since the
+    cached token may have been rotated. When the debouncer is configured, targets
+    already dispatched within its window are skipped (status 208), and the claims of
+    dispatches that failed are released.
+    """
+    targets = [dispatch_target(target) for target in event_targets]
+    claims = [debouncer.claim(target) if debouncer else 0.0 for target in targets]
+    to_send = [index for index, claimed_at in enumerate(claims) if claimed_at is not None]
+
+    # Only targets whose claim was refused are skipped; that can only happen with a debouncer configured
+    results = [skipped_result(target) if claimed_at is None else None for target, claimed_at in zip(targets, claims)]
+    sent_results = asyncio.run(
+        dispatch_workflows([targets[index] for index in to_send], os.environ.get("GITHUB_TOKEN"))
+    )
+    for index, result in zip(to_send, sent_results):
+        results[index] = result
+
+    unauthorized = [index for index, result in enumerate(results) if result["status_code"] == 401]
+    if unauthorized:
+        load_secrets_manager_environment_variables(force_refresh=True)
+        retried = asyncio.run(
+            dispatch_workflows([targets[index] for index in unauthorized], os.environ.get("GITHUB_TOKEN"))
+        )
+        for index, result in zip(unauthorized, retried):
+            results[index] = result
+
+    if debouncer:
+        for index in to_send:
+            if not results[index]["success"]:
+                debouncer.release(targets[index], claims[index])
+
+    skipped = len(targets) - len(to_send)
+    sent = sum(results[index]["success"] for index in to_send)
+    failed = len(to_send) - sent
+    print(f"Workflow dispatches: {sent} sent, {skipped} skipped, {failed} failed")
+    if not failed:
+        # 208 Already Reported when every target was a duplicate
+        status_code = 204 if sent else 208
+    else:
+        # 207 Multi-Status when only some of the targets were triggered
+        status_code = 207 if sent or skipped else 502
+    return {
+        "statusCode": status_code,
+        "body": {"sent": sent, "skipped": skipped, "failed": failed, "results": results},
+    }
 
 
 def main(event: dict, context: dict) -> dict:
@@ -90,7 +184,8 @@ def main(event: dict, context: dict) -> dict:
 
     This function is invoked by Amazon EventBridge when a configured event rule matches. It extracts
     configuration from environment variables and optional event data, then triggers a GitHub Actions
-    workflow via the GitHub REST API.
+    workflow via the GitHub REST API. An event without `targets` is dispatched as a single target built
+    from the environment defaults and the event's `inputs`, through the same path as a `targets` event.
 
     Environment Variables:
         GITHUB_TOKEN (required): GitHub Personal Access Token with 'actions:write' permission
@@ -102,37 +197,45 @@ def main(event: dict, context: dict) -> dict:
     Event Format:
         The event dictionary can optionally contain:
         - inputs (dict): Workflow inputs to pass (only if workflow defines workflow_dispatch.inputs)
+        - targets (list[dict]): Workflows to trigger in one invocation, each with optional `owner`, `repo`,
+          `workflow`, `ref` and `inputs` keys (missing keys fall back to the environment variables). The
+          targets are dispatched concurrently, at most DISPATCH_CONCURRENCY (default: 8) at a time.
+
+    When DISPATCH_DEDUP_TABLE (DynamoDB) or DISPATCH_DEDUP_PATH (local JSON file) is set, a dispatch with the
+    same repository, workflow, ref and inputs as one sent in the last DISPATCH_DEBOUNCE_SECONDS (default: 60)
+    is skipped and reported with status 208.
 
     Args:
         event (dict): The EventBridge event payload. May contain:
             - inputs (dict, optional): Workflow inputs to pass to GitHub Actions
+            - targets (list[dict], optional): Several workflows to trigger concurrently
         context (dict): The Lambda context object containing runtime information
 
     Returns:
         dict: Lambda response dictionary with:
-            - statusCode (int): HTTP status code (200, 400, or from GitHub API)
-            - body (dict): Response body containing the result from trigger_github_workflow_dispatch()
+            - statusCode (int): 400 when GITHUB_TOKEN is missing. For an event without `targets`, the status of
+              its dispatch (204 from GitHub on success, GitHub's error code, 500 on a request error, 208 when
+              skipped as a duplicate). For `targets` events, 204 when every dispatch succeeded, 207 when some did,
+              502 when none did and 208 when every target was skipped
+            - body (dict): For an event without `targets`, the dispatch result (`status_code`, `message`,
+              `success` and, on failure, `response_body`). For `targets` events, the sent/skipped/failed counts
+              and a `results` list with one entry per target
     """
     print("Starting Lambda function")
     load_secrets_manager_environment_variables()
     print(f"Received EventBridge event: {event}")
     print(f"Lambda context: {context}")
-    github_token: str = os.environ.get("GITHUB_TOKEN")
-    owner: str = os.environ.get("GITHUB_OWNER", "scondo-prof")
-    repo: str = os.environ.get("GITHUB_REPO", "the_ticketing_system")
-    workflow_id: str = os.environ.get("GITHUB_WORKFLOW", "github-issues-discord-integration.yml")
-    branch: str = os.environ.get("GITHUB_BRANCH", "main")
-
-    inputs = event.get("inputs") if event else None
-
-    if not github_token:
+    if not os.environ.get("GITHUB_TOKEN"):
         return {"statusCode": 400, "body": "GITHUB_TOKEN environment variable is required"}
 
-    result = trigger_github_workflow_dispatch(
-        owner=owner, repo=repo, workflow_id=workflow_id, github_token=github_token, ref=branch, inputs=inputs
-    )
+    if event and event.get("targets"):
+        return dispatch_many(event["targets"])
 
-    return {"statusCode": result.get("status_code", 200), "body": result}
+    # Single-target event: dispatched as a one-element list, answered in the response shape it always had
+    inputs = event.get("inputs") if event else None
+    result = dispatch_many([{"inputs": inputs}])["body"]["results"][0]
+    body = {key: value for key, value in result.items() if key not in TARGET_KEYS}
+    return {"statusCode": result["status_code"], "body": body}
 
 
 if __name__ == "__main__":
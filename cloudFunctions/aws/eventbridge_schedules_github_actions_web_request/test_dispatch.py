@@ -0,0 +1,41 @@
+import main
+
+
+def stub_dispatch_workflows(status_code: int = 204):
+    async def dispatch_workflows(targets: list[dict], github_token: str) -> list[dict]:
+        return [{**target, "status_code": status_code, "success": status_code == 204} for target in targets]
+
+    return dispatch_workflows
+
+
+def test_dispatch_many_without_debouncer(monkeypatch):
+    monkeypatch.setattr(main, "debouncer", None)
+    monkeypatch.setattr(main, "dispatch_workflows", stub_dispatch_workflows())
+
+    response = main.dispatch_many([{"workflow": "a.yml"}, {"workflow": "b.yml"}])
+
+    assert response["statusCode"] == 204
+    assert response["body"]["sent"] == 2
+    assert response["body"]["skipped"] == 0
+    assert [result["workflow"] for result in response["body"]["results"]] == ["a.yml", "b.yml"]
+
+
+def test_main_with_default_env(monkeypatch):
+    for name in ("DISPATCH_DEDUP_TABLE", "DISPATCH_DEDUP_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setattr(main, "debouncer", main.dispatch_debouncer_from_env())
+    monkeypatch.setattr(main, "load_secrets_manager_environment_variables", lambda force_refresh=False: True)
+    monkeypatch.setattr(main, "dispatch_workflows", stub_dispatch_workflows())
+
+    response = main.main({}, {})
+    assert response == {
+        "statusCode": 204,
+        "body": {"status_code": 204, "success": True},
+    }
+    assert main.main({"inputs": {"days": "7"}}, {})["statusCode"] == 204
+    assert main.main({"targets": [{"workflow": "a.yml"}, {"workflow": "b.yml"}]}, {})["statusCode"] == 204
+
+    monkeypatch.setattr(main, "dispatch_workflows", stub_dispatch_workflows(404))
+    assert main.main({}, {})["statusCode"] == 404
+    assert main.main({"targets": [{"workflow": "a.yml"}]}, {})["statusCode"] == 502
@@ -1,157 +1,48 @@
 from dotenv import load_dotenv
 import os
-import json
-import httpx
-import boto3
-
-load_dotenv()
-
-
-def delete_ruleset(repo_name: str, org: str, token: str, ruleset_id: str) -> str:
-    url = f"https://api.github.com/repos/{org}/{repo_name}/rulesets/{ruleset_id}"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-    response = httpx.delete(url, headers=headers)
-
-    if response.status_code == 204:
-        response_message = (
-            f"Successfully Deleted Ruleset: {ruleset_id} From Repo: {repo_name}"
-        )
-        print(response_message)
-
-    else:
-        response_message = (
-            f"Failed to Deleted Ruleset: {ruleset_id} From Repo: {repo_name}"
-        )
-        print(response_message)
-
-
-def apply_repo_ruleset(repo_name: str, org: str, token: str) -> None:
-
-    url = f"https://api.github.com/repos/{org}/{repo_name}/rulesets"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-    data = {
-        "name": "main-protection",
-        "target": "branch",
-        "enforcement": "active",
-        "bypass_actors": [
-            {"actor_id": 1, "actor_type": "OrganizationAdmin", "bypass_mode": "always"}
-        ],
-        "conditions": {"ref_name": {"exclude": [], "include": ["~DEFAULT_BRANCH"]}},
-        "rules": [
-            {"type": "deletion"},
-            {"type": "non_fast_forward"},
-            {
-                "type": "pull_request",
-                "parameters": {
-                    "required_approving_review_count": 1,
-                    "dismiss_stale_reviews_on_push": False,
-                    "require_code_owner_review": False,
-                    "require_last_push_approval": False,
-                    "required_review_thread_resolution": False,
-                },
-            },
-        ],
-    }
-
-    response = httpx.post(url, headers=headers, data=json.dumps(data))
-
-    print(response.status_code)
-    if response.status_code == 201:
-        print(f"-- Successfully Added Ruleset to {repo_name} --")
-
-    else:
-        print(f"Failed to Add Ruleset to {repo_name} --")
+import sys
 
+# Shared request helpers from github/ and cloudFunctions/aws/shared, copied next to this handler by the Dockerfile
+# (local runs use the repo paths)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "github")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shared")))
 
-def get_repo_rulesets(org: str, token: str, repo_name: str) -> list:
+from github_client import GitHubRequestError
+from repo_inventory import inventory_store_from_env
+from ruleset_reconciler import run_reconciliation, print_summary
+from secrets_cache import get_secret, get_secrets_cache
 
-    url = f"https://api.github.com/repos/{org}/{repo_name}/rulesets"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-    response = httpx.get(url, headers=headers)
-
-    rules = response.json()
-
-    return rules
-
-
-def get_github_repositories(token: str, org: str) -> list:
-    repos = []
-    count = 1
-
-    url = f"https://api.github.com/orgs/{org}/repos?page={count}"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-    response = httpx.get(url, headers=headers)
+load_dotenv()
 
-    repos += response.json()
 
-    if response.status_code == 200:
-        while len(response.json()) == 30:
-            count += 1
-            url = f"https://api.github.com/orgs/{org}/repos?page={count}"
-            response = httpx.get(url, headers=headers)
-            repos += response.json()
-        return repos
+def lambda_handler(event: dict, context: dict) -> dict:
+    # Cached across warm invocations; refreshed once if GitHub rejects the cached token (e.g. after a rotation)
+    try:
+        summary = reconcile(event, get_secret(os.getenv("github_secrets")))
+    except GitHubRequestError as e:
+        if e.status_code != 401:
+            raise
+        summary = reconcile(event, get_secret(os.getenv("github_secrets"), force_refresh=True))
+    print(f"Secrets cache: {get_secrets_cache().stats()}")
 
-    else:
-        print(f"Failed to fetch repositories: {response.status_code}")
-        print(response.json())
-        return {}
+    # Per-repo details stay in the logs; the invocation result only carries the outcome lists
+    return {key: value for key, value in summary.items() if key != "results"}
 
 
-def lambda_handler(event: dict, context: dict) -> None:
-    sm = boto3.client("secretsmanager")
-    github_secrets = json.loads(
-        sm.get_secret_value(SecretId=os.getenv("github_secrets"))["SecretString"]
-    )
+def reconcile(event: dict, github_secrets: dict) -> dict:
     org = github_secrets["org"]
     token = github_secrets["token"]
 
-    repos = get_github_repositories(token=token, org=org)
-
-    for repo in repos:
-        repo_name = repo["name"]
-        print(f"-- Checking {repo_name} --")
-
-        rules = get_repo_rulesets(org=org, token=token, repo_name=repo_name)
-
-        if rules:
-            has_rule = False
-            for rule in rules:
-                if rule["name"] == "main-protection":
-                    has_rule = True
-                    ruleset_id = rule["id"]
-                    break
-            if has_rule and github_secrets["overwrite"] == "No":
-                print("-- Has Main Protection --")
-                continue
-            elif has_rule and github_secrets["overwrite"] == "Yes":
-                print("-- Has Main Protection --")
-                print(f"-- Deleting Rule: {ruleset_id} From Repo: {repo_name} --")
-                delete_ruleset(
-                    repo_name=repo_name, org=org, token=token, ruleset_id=ruleset_id
-                )
-                print(f"-- Making Rule for Repo: {repo_name} --")
-
-        else:
-            print(f"-- Making Rule for Repo: {repo_name} --")
-            apply_repo_ruleset(repo_name=repo_name, org=org, token=token)
+    summary = run_reconciliation(
+        org=org,
+        token=token,
+        overwrite=github_secrets["overwrite"] == "Yes",
+        concurrency=int(os.getenv("RECONCILE_CONCURRENCY", "10")),
+        inspection=os.getenv("RULESET_INSPECTION", "graphql"),
+        dry_run=os.getenv("DRY_RUN", "No") == "Yes",
+        # Snapshot in S3 (INVENTORY_S3_BUCKET) so only new or changed repos are inspected between runs
+        inventory_store=inventory_store_from_env(),
+        full_sweep=bool(event and event.get("full_sweep")),
+    )
+    print_summary(summary)
+    return summary
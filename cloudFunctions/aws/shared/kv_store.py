@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+from collections.abc import Callable
+
+from json_files import write_json_atomic
+
+
+class JsonFileStore:
+    """A JSON document in a local file, used as the stand-in for DynamoDB/S3 backed stores.
+
+    Callers hold `lock` around a load-modify-save sequence so threads of one
+    process never interleave their updates.
+
+    Args:
+        path: Location of the JSON file.
+        default: Returns the document used when the file is missing or unreadable.
+    """
+
+    def __init__(self, path: str, default: Callable[[], dict] = dict) -> None:
+        self.path = path
+        self.default = default
+        self.lock = threading.Lock()
+
+    def load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return self.default()
+
+    def save(self, data: dict) -> None:
+        write_json_atomic(self.path, data)
+
+
+class DynamoDBTable:
+    """Thin wrapper around a DynamoDB table for conditional writes.
+
+    Each method returns False instead of raising when its condition does not
+    hold, which is how the stores built on it detect that another execution
+    got there first.
+
+    Args:
+        table_name: DynamoDB table name.
+    """
+
+    def __init__(self, table_name: str) -> None:
+        import boto3
+
+        self.table = boto3.resource("dynamodb").Table(table_name)
+        self._conditional_check_failed = self.table.meta.client.exceptions.ConditionalCheckFailedException
+
+    def put_if(self, item: dict, condition: str, values: dict, return_old: bool = False) -> tuple[bool, dict | None]:
+        """Put `item` if `condition` holds; returns whether it was written and, with `return_old`, the old item."""
+        kwargs = {"ReturnValues": "ALL_OLD"} if return_old else {}
+        try:
+            response = self.table.put_item(
+                Item=item, ConditionExpression=condition, ExpressionAttributeValues=values, **kwargs
+            )
+        except self._conditional_check_failed:
+            return False, None
+        return True, response.get("Attributes")
+
+    def update_if(self, key: dict, update: str, condition: str, values: dict) -> bool:
+        try:
+            self.table.update_item(
+                Key=key, UpdateExpression=update, ConditionExpression=condition, ExpressionAttributeValues=values
+            )
+        except self._conditional_check_failed:
+            return False
+        return True
+
+    def delete_if(self, key: dict, condition: str, values: dict) -> bool:
+        try:
+            self.table.delete_item(Key=key, ConditionExpression=condition, ExpressionAttributeValues=values)
+        except self._conditional_check_failed:
+            return False
+        return True
+
+
+def store_from_env(table_variable: str, path_variable: str, dynamodb_store: Callable, json_store: Callable):
+    """Build a store from the DynamoDB table named in `table_variable`, or else the JSON file in `path_variable`.
+
+    Returns:
+        The store, or None when neither variable is set (the feature is disabled).
+    """
+    if os.getenv(table_variable):
+        return dynamodb_store(os.environ[table_variable])
+    if os.getenv(path_variable):
+        return json_store(os.environ[path_variable])
+    return None
@@ -0,0 +1,193 @@
+import abc
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from secrets_cache import get_secret, get_secrets_cache
+
+# Slack and Discord answer a revoked or rotated webhook URL with one of these
+WEBHOOK_AUTH_FAILURE_CODES = (401, 403, 404, 410)
+# (connect, read) timeout in seconds for one webhook post
+DEFAULT_TIMEOUT = (3.05, float(os.getenv("NOTIFIER_TIMEOUT_SECONDS", "10")))
+DISCORD_CONTENT_LIMIT = 2000
+
+# This is a list of icons that we have in our slack channel
+EMOJI_LIST = [
+    ":catjam:",
+    ":excuseme:",
+    ":meow_party:",
+    ":sonicdance_pbjtime:",
+    ":typingcat:",
+    ":snoop_pls:",
+    ":sadpepe:",
+    ":leo-toast:",
+    ":10-4:",
+    ":3178-pepe-suffering:",
+    ":9947_wiseau:",
+    ":759906233397674015:",
+    ":get-out:",
+    ":amusement:",
+    ":baited:",
+    ":good_jello:",
+    ":hello:",
+    ":scared_af:",
+    ":slov-squat-pepe:",
+    ":sus_squirrel:",
+    ":wanted_chicken:",
+    ":zoom_zoom:",
+    ":zoom_zoom_zoom:",
+    ":zoom_zoom_zoom_zoom:",
+]
+
+
+def create_session(pool_size: int = 4) -> requests.Session:
+    """Session with keep-alive connections and retries on 429/5xx (webhook posts are safe to repeat)."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Module scope so the connections stay open between warm invocations of the same execution environment
+session = create_session()
+
+
+class WebhookSink(abc.ABC):
+    """Posts messages to a webhook whose URL is kept in Secrets Manager.
+
+    The URL is read through the shared secrets cache; when the webhook
+    answers with an auth failure the secret is refreshed and the post is
+    retried once, since the cached URL may be stale after a rotation.
+
+    Args:
+        name: Label used in logs and results.
+        secret_id: Secrets Manager id of the webhook URL.
+    """
+
+    def __init__(self, name: str, secret_id: str) -> None:
+        self.name = name
+        self.secret_id = secret_id
+
+    @abc.abstractmethod
+    def payloads(self, message: str) -> list[dict]:
+        """Split `message` into the JSON bodies to post, in order."""
+
+    def _post(self, payload: dict, force_refresh: bool = False) -> requests.Response:
+        webhook = get_secret(self.secret_id, force_refresh=force_refresh)
+        return session.post(webhook, json=payload, timeout=DEFAULT_TIMEOUT)
+
+    def send(self, message: str) -> int:
+        """Post the message and return the status code of the last post."""
+        status_code = 0
+        for payload in self.payloads(message):
+            response = self._post(payload)
+            if response.status_code in WEBHOOK_AUTH_FAILURE_CODES:
+                response = self._post(payload, force_refresh=True)
+            response.raise_for_status()
+            status_code = response.status_code
+        return status_code
+
+
+class SlackSink(WebhookSink):
+    def __init__(self, secret_id: str, channel: str, username: str) -> None:
+        super().__init__("slack", secret_id)
+        self.channel = channel
+        self.username = username
+
+    def payloads(self, message: str) -> list[dict]:
+        return [
+            {
+                "channel": self.channel,
+                "username": self.username,
+                "text": message,
+                "icon_emoji": random.choice(EMOJI_LIST),
+            }
+        ]
+
+
+class DiscordSink(WebhookSink):
+    def __init__(self, secret_id: str, username: str | None = None) -> None:
+        super().__init__("discord", secret_id)
+        self.username = username
+
+    def payloads(self, message: str) -> list[dict]:
+        # Discord rejects content over 2000 characters, so longer alerts are posted in parts
+        parts = [message[i : i + DISCORD_CONTENT_LIMIT] for i in range(0, len(message), DISCORD_CONTENT_LIMIT)] or [""]
+        payloads = [{"content": part} for part in parts]
+        if self.username:
+            for payload in payloads:
+                payload["username"] = self.username
+        return payloads
+
+
+def sinks_from_env() -> list[WebhookSink]:
+    """Slack when WEBHOOK (with CHANNEL and USER) is set, Discord when DISCORD_WEBHOOK is set; both hold secret ids."""
+    sinks: list[WebhookSink] = []
+    if os.getenv("WEBHOOK"):
+        sinks.append(SlackSink(os.environ["WEBHOOK"], os.environ["CHANNEL"], os.environ["USER"]))
+    if os.getenv("DISCORD_WEBHOOK"):
+        sinks.append(DiscordSink(os.environ["DISCORD_WEBHOOK"], os.getenv("USER")))
+    return sinks
+
+
+_sinks: list[WebhookSink] | None = None
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notifier")
+        return _executor
+
+
+def _send(sink: WebhookSink, message: str) -> int | str:
+    try:
+        return sink.send(message)
+    except Exception as error:
+        # A failing sink must not stop the alert from reaching the others
+        print(f"{sink.name} notification failed: {error}")
+        return str(error)
+
+
+def notify(message: str, sinks: list[WebhookSink] | None = None) -> dict[str, int | str]:
+    """Send an alert to every sink concurrently.
+
+    Args:
+        message: Alert text.
+        sinks: Sinks to post to; `sinks_from_env()` (built once per execution environment) when omitted.
+
+    Returns:
+        dict[str, int | str]: Status code per sink name, or the error text of a sink that failed.
+    """
+    global _sinks
+    if sinks is None:
+        if _sinks is None:
+            _sinks = sinks_from_env()
+        sinks = _sinks
+
+    if len(sinks) == 1:
+        results = {sinks[0].name: _send(sinks[0], message)}
+    else:
+        futures = {sink.name: _get_executor().submit(_send, sink, message) for sink in sinks}
+        results = {name: future.result() for name, future in futures.items()}
+
+    print(f"Notified: {results}")
+    print(f"Secrets cache: {get_secrets_cache().stats()}")
+    return results
@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+import time
+
+DEFAULT_TTL_SECONDS = 300.0
+
+
+class JsonFileSecretsManager:
+    """Local stand-in for the Secrets Manager client, serving secrets from a JSON file.
+
+    The file maps SecretId to the secret value; non-string values are stored
+    JSON-encoded, as Secrets Manager would return them. Only `get_secret_value`
+    is implemented, and `calls` counts how often it was used.
+
+    Args:
+        path: Location of the JSON file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.calls = 0
+
+    def get_secret_value(self, SecretId: str) -> dict:
+        self.calls += 1
+        with open(self.path, encoding="utf-8") as f:
+            secrets = json.load(f)
+        if SecretId not in secrets:
+            raise KeyError(f"Secret {SecretId} not found in {self.path}")
+        value = secrets[SecretId]
+        return {"Name": SecretId, "SecretString": value if isinstance(value, str) else json.dumps(value)}
+
+
+def secrets_client_from_env():
+    """Use the local JSON file in LOCAL_SECRETS_PATH when set, otherwise a boto3 Secrets Manager client."""
+    if os.getenv("LOCAL_SECRETS_PATH"):
+        return JsonFileSecretsManager(os.environ["LOCAL_SECRETS_PATH"])
+    import boto3
+
+    return boto3.client("secretsmanager")
+
+
+class SecretsCache:
+    """Caches decoded Secrets Manager values in memory for warm Lambda invocations.
+
+    A secret is fetched once and then served from memory until `ttl_seconds`
+    have passed, so a burst of invocations on the same execution environment
+    costs one `get_secret_value` call instead of one per invocation. Callers
+    that get an authentication failure with a cached secret (e.g. after a
+    rotation) pass `force_refresh=True` to fetch it again immediately.
+
+    JSON secret strings are decoded; anything else is returned as the raw string.
+
+    Args:
+        client: Object with a Secrets Manager style `get_secret_value(SecretId=...)`;
+            `secrets_client_from_env()` is used when omitted.
+        ttl_seconds: How long a fetched secret is served from memory.
+    """
+
+    def __init__(self, client=None, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[object, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @property
+    def client(self):
+        # Created on first use so importing a handler does not need AWS credentials or a region
+        if self._client is None:
+            self._client = secrets_client_from_env()
+        return self._client
+
+    def get(self, secret_id: str, force_refresh: bool = False):
+        """Return the decoded secret, fetching it when it is missing, expired or a refresh is forced."""
+        with self._lock:
+            entry = self._entries.get(secret_id)
+            if entry is not None and not force_refresh and time.monotonic() < entry[1]:
+                self.hits += 1
+                return entry[0]
+
+            if force_refresh:
+                self.refreshes += 1
+            else:
+                self.misses += 1
+            secret_string = self.client.get_secret_value(SecretId=secret_id)["SecretString"]
+            try:
+                value = json.loads(secret_string)
+            except ValueError:
+                value = secret_string
+            self._entries[secret_id] = (value, time.monotonic() + self.ttl_seconds)
+            return value
+
+    def invalidate(self, secret_id: str | None = None) -> None:
+        """Drop one cached secret, or all of them when `secret_id` is None."""
+        with self._lock:
+            if secret_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(secret_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.refreshes
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Module scope survives between warm invocations of the same execution environment
+_shared_cache: SecretsCache | None = None
+
+
+def get_secrets_cache() -> SecretsCache:
+    """Return the process-wide cache; the TTL comes from SECRETS_CACHE_TTL_SECONDS (default 300)."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SecretsCache(ttl_seconds=float(os.getenv("SECRETS_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)))
+    return _shared_cache
+
+
+def get_secret(secret_id: str, force_refresh: bool = False):
+    """Fetch a decoded secret through the shared cache."""
+    return get_secrets_cache().get(secret_id, force_refresh=force_refresh)
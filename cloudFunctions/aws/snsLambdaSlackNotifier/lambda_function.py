@@ -1,10 +1,16 @@
-import slack_notifier
+import os
+import sys
+
+# Shared modules from cloudFunctions/aws/shared, copied next to this module by the Dockerfile (local runs use the repo path)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "shared")))
+
+from notifier import notify
 from sns_handling import sns_main
 
 
 def lambda_handler(event, context):
 
-    print(event)
-    # --- For SNS notifications to slack ---
-    sns_message = sns_main(event=event)
-    slack_notifier.slack_notifier(sns_message)
+    print(f"Received {len(event['Records'])} SNS record(s)")
+    # --- One digest per batch to Slack (and Discord when configured), split only past the size limit ---
+    for sns_message in sns_main(event=event):
+        notify(sns_message)
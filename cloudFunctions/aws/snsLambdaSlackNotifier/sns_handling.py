@@ -1,18 +1,31 @@
 import json
 
+# Slack truncates long messages; digests are split into chunks of at most this many characters
+MAX_SLACK_MESSAGE_LENGTH = 4000
+
 
 def sns_notification_to_data(event: dict) -> dict:
 
-    sns_data = {}
+    return sns_notifications_to_data(event=event)[0]
+
+
+def sns_notifications_to_data(event: dict) -> list[dict]:
+    """Parse the alarm notification of every record in an SNS delivery, in one pass."""
 
-    actionable_info = event["Records"][0]["Sns"]["Message"]
-    actionable_info = json.loads(actionable_info)
+    notifications = []
 
-    sns_data["alarm_name"] = actionable_info["AlarmName"]
-    sns_data["aws_account"] = actionable_info["AWSAccountId"]
-    sns_data["alert_message"] = actionable_info["NewStateReason"]
+    for record in event["Records"]:
+        actionable_info = json.loads(record["Sns"]["Message"])
+        notifications.append(
+            {
+                "alarm_name": actionable_info["AlarmName"],
+                "aws_account": actionable_info["AWSAccountId"],
+                "alert_message": actionable_info["NewStateReason"],
+                "state": actionable_info.get("NewStateValue", "ALARM"),
+            }
+        )
 
-    return sns_data
+    return notifications
 
 
 def sns_message_create(sns_data: dict) -> str:
@@ -36,8 +49,65 @@ Metric in alarm: {sns_data["alarm_name"]}
     return sns_message
 
 
-def sns_main(event) -> str:
-    sns_data = sns_notification_to_data(event=event)
-    sns_message = sns_message_create(sns_data=sns_data)
+def group_notifications(notifications: list[dict]) -> dict[tuple[str, str], list[dict]]:
+    """Group notifications by (account, state), keeping the order in which each group first appears."""
+    groups = {}
+    for sns_data in notifications:
+        groups.setdefault((sns_data["aws_account"], sns_data["state"]), []).append(sns_data)
+    return groups
 
-    return sns_message
+
+def sns_digest_create(notifications: list[dict], max_length: int = MAX_SLACK_MESSAGE_LENGTH) -> list[str]:
+    """Render a batch of notifications as one compact digest, split at alarm lines into chunks of at most `max_length`.
+
+    A group header (account, state and count) is repeated at the top of a
+    chunk when its group continues from the previous chunk.
+    """
+    title = f"""
+===================================
+
+| ALERT DIGEST | {len(notifications)} notification(s)
+"""
+    messages = []
+    parts = [title]
+    length = len(title)
+
+    for (account, state), group in group_notifications(notifications).items():
+        header = f"""
+-----------------------------------
+AWS Account: {account} | {state} ({len(group)})
+"""
+        header_added = False
+        for sns_data in group:
+            line = f"• {sns_data['alarm_name']}: {sns_data['alert_message']}\n"
+            if len(line) > max_length - len(title) - len(header):
+                line = line[: max_length - len(title) - len(header) - 4] + "...\n"
+            # The header is only added together with the group's first line, so a chunk never ends on a bare header
+            needed = len(line) if header_added else len(header) + len(line)
+            if length + needed > max_length:
+                messages.append("".join(parts))
+                parts = [title]
+                length = len(title)
+                if header_added:
+                    parts.append(header)
+                    length += len(header)
+            if not header_added:
+                parts.append(header)
+                length += len(header)
+                header_added = True
+            parts.append(line)
+            length += len(line)
+
+    messages.append("".join(parts))
+    return messages
+
+
+def sns_main(event) -> list[str]:
+    notifications = sns_notifications_to_data(event=event)
+    if len(notifications) == 1:
+        return [sns_message_create(sns_data=notifications[0])]
+
+    sns_messages = sns_digest_create(notifications=notifications)
+    print(f"{len(notifications)} notification(s) rendered into {len(sns_messages)} digest message(s)")
+
+    return sns_messages
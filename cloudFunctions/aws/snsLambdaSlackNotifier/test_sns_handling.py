@@ -0,0 +1,31 @@
+from sns_handling import sns_digest_create
+
+
+def notification(account: str, state: str, alarm_name: str, alert_message: str) -> dict:
+    return {"aws_account": account, "state": state, "alarm_name": alarm_name, "alert_message": alert_message}
+
+
+def test_digest_chunks_stay_within_max_length_at_group_boundary():
+    for message_length in range(990, 1000):
+        notifications = [
+            notification("111111111111", "ALARM", "first", "x" * message_length),
+            notification("222222222222", "OK", "second", "y" * message_length),
+        ]
+
+        messages = sns_digest_create(notifications, max_length=1200)
+
+        assert all(len(message) <= 1200 for message in messages)
+        # No chunk ends on a group header without any alarm line below it
+        assert all(not message.rstrip().endswith(")") for message in messages)
+        assert sum(message.count("AWS Account: 222222222222") for message in messages) == 1
+
+
+def test_digest_repeats_group_header_when_group_continues():
+    notifications = [notification("111111111111", "ALARM", f"alarm-{i}", "z" * 300) for i in range(8)]
+
+    messages = sns_digest_create(notifications, max_length=1200)
+
+    assert len(messages) > 1
+    assert all(len(message) <= 1200 for message in messages)
+    assert all("AWS Account: 111111111111 | ALARM (8)" in message for message in messages)
+    assert sum(message.count("• alarm-") for message in messages) == 8
@@ -2,9 +2,8 @@ from dotenv import load_dotenv
 import os
 import json
 
-from github_get_requests import get_repo_rulesets, get_github_repositories
-from github_post_requests import apply_repo_ruleset
-from github_delete_requests import delete_ruleset
+from repo_inventory import inventory_store_from_env
+from ruleset_reconciler import run_reconciliation, print_summary
 
 load_dotenv()
 
@@ -12,39 +11,21 @@ load_dotenv()
 
 
 
-def main() -> None:
+def main() -> dict:
     github_secrets = json.loads(os.getenv("github_secret"))
     org = github_secrets["org"]
     token = github_secrets["token"]
 
-    print(github_secrets)
-
-    repos = get_github_repositories(token=token, org=org)
-
-    for repo in repos:
-        repo_name = repo["name"]
-        print(f"-- Checking {repo_name} --")
-
-        rules = get_repo_rulesets(org= org, token=token, repo_name= repo_name)
-
-        
-
-        if rules:
-            has_rule = False
-            for rule in rules:
-                if rule["name"] == "main-protection":
-                    has_rule = True
-                    ruleset_id = rule["id"]
-                    break
-            if has_rule and github_secrets["overwrite"] == "No":
-                print("-- Has Main Protection --")
-                continue   
-            elif has_rule and github_secrets["overwrite"] == "Yes":
-                print("-- Has Main Protection --")
-                print(f"-- Deleting Rule: {ruleset_id} From Repo: {repo_name} --")
-                delete_ruleset(repo_name=repo_name, org=org, token=token, ruleset_id=ruleset_id)
-                print(f"-- Making Rule for Repo: {repo_name} --")
-
-        else:
-            print(f"-- Making Rule for Repo: {repo_name} --")
-            apply_repo_ruleset(repo_name=repo_name, org=org, token=token)
\ No newline at end of file
+    summary = run_reconciliation(
+        org=org,
+        token=token,
+        overwrite=github_secrets["overwrite"] == "Yes",
+        concurrency=int(github_secrets.get("concurrency", 10)),
+        inspection=github_secrets.get("inspection", "graphql"),
+        dry_run=github_secrets.get("dry_run", "No") == "Yes",
+        inventory_store=inventory_store_from_env(),
+        full_sweep=github_secrets.get("full_sweep", "No") == "Yes",
+    )
+    print_summary(summary)
+
+    return summary
\ No newline at end of file
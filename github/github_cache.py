@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import httpx
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+class GitHubResponseCache:
+    """On-disk cache of GitHub GET responses used for conditional requests.
+
+    Each entry stores the body, headers, `ETag` and `Last-Modified` of a 200
+    response. Before a GET the client sends `If-None-Match` /
+    `If-Modified-Since` from the cached entry; GitHub answers 304 when nothing
+    changed, which does not count against the rate limit, and the cached body
+    is served instead.
+
+    Entries are keyed by the full request URL plus a hash of the token, so
+    tokens with different visibility never share responses. Callers whose
+    token rotates every run (e.g. the Actions GITHUB_TOKEN) can pass a stable
+    `identity` to key on instead. The cache is bounded both by total size on
+    disk and by entry age, measured from the last 200 or 304 for the entry;
+    the oldest entries are evicted first.
+
+    Lookups and stores are blocking file I/O; `AsyncGitHubClient` runs
+    `prepare` and `resolve` in a worker thread so they never stall the event loop.
+    One cache may be shared by many threads (e.g. `iter_pages`' prefetch thread):
+    writes, eviction and the counters are serialized by a lock.
+
+    Args:
+        cache_dir: Directory holding one JSON file per cached response.
+        max_bytes: Upper bound on the total size of cached entries.
+        max_age_seconds: Entries older than this are evicted.
+        identity: Optional stable stand-in for the token when building cache keys.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS,
+        identity: str | None = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.identity = identity
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evict()
+
+    def _entry_path(self, url: str, token: str) -> str:
+        token_id = hashlib.sha256((self.identity or token).encode("utf-8")).hexdigest()[:16]
+        key = hashlib.sha256(f"{token_id}:{url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def lookup(self, url: str, token: str) -> dict | None:
+        path = self._entry_path(url, token)
+        try:
+            # Age is taken from the mtime, as in eviction, so a 304 (which touches the file) keeps the entry fresh
+            if time.time() - os.stat(path).st_mtime > self.max_age_seconds:
+                return None
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, token: str, response: httpx.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            "url": url,
+            "stored_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": dict(response.headers),
+            "body": response.text,
+        }
+        path = self._entry_path(url, token)
+        payload = json.dumps(entry).encode("utf-8")
+        with self._lock:
+            try:
+                # Overwriting an entry (e.g. after revalidation) replaces its bytes rather than adding to the total
+                previous_size = os.stat(path).st_size
+            except OSError:
+                previous_size = 0
+            with open(path, "wb") as f:
+                f.write(payload)
+            self._total_bytes += len(payload) - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the oldest entries until the cache fits in `max_bytes`."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        now = time.time()
+        entries: list[tuple[float, int, str]] = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            total_bytes -= size
+        self._total_bytes = total_bytes
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+            self.evictions += 1
+        except OSError:
+            pass
+
+    def prepare(self, request: httpx.Request, token: str) -> dict | None:
+        """Attach conditional headers for a cached entry and return that entry."""
+        entry = self.lookup(str(request.url), token)
+        if entry:
+            request.headers.update(self.conditional_headers(entry))
+        return entry
+
+    def resolve(self, request: httpx.Request, response: httpx.Response, entry: dict | None, token: str) -> httpx.Response:
+        """Turn a 304 into the cached 200 response, or store a fresh 200 for next time."""
+        if response.status_code == 304 and entry:
+            with self._lock:
+                self.hits += 1
+            try:
+                # Refresh the entry's mtime so frequently revalidated responses are evicted last
+                os.utime(self._entry_path(str(request.url), token))
+            except OSError:
+                # Another thread evicted the entry after prepare(); the body read then is still valid
+                pass
+            headers = {k: v for k, v in entry["headers"].items() if k.lower() not in ("content-encoding", "content-length")}
+            return httpx.Response(200, headers=headers, content=entry["body"].encode("utf-8"), request=request)
+
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.store(str(request.url), token, response)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def cache_from_env() -> GitHubResponseCache | None:
+    """Build a cache from GITHUB_CACHE_DIR, or return None when it is unset.
+
+    GITHUB_CACHE_MAX_BYTES, GITHUB_CACHE_MAX_AGE_SECONDS and GITHUB_CACHE_IDENTITY
+    optionally override the size bound, age bound and token identity.
+    """
+    cache_dir = os.getenv("GITHUB_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return GitHubResponseCache(
+        cache_dir=cache_dir,
+        max_bytes=int(os.getenv("GITHUB_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        max_age_seconds=int(os.getenv("GITHUB_CACHE_MAX_AGE_SECONDS", DEFAULT_MAX_AGE_SECONDS)),
+        identity=os.getenv("GITHUB_CACHE_IDENTITY"),
+    )
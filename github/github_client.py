@@ -0,0 +1,209 @@
+import asyncio
+import importlib.util
+
+import httpx
+
+from github_cache import GitHubResponseCache
+from github_rate_limit import RateLimitGovernor, get_rate_limit_governor, rate_limit_resource
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_API_VERSION = "2022-11-28"
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+class GitHubRequestError(Exception):
+    """Raised by the github/ request helpers when GitHub answers with an error.
+
+    Args:
+        message: Description of the failed request.
+        status_code: HTTP status code of the response (200 for GraphQL responses that carry `errors`).
+    """
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def github_headers(token: str) -> dict[str, str]:
+    """Build the default headers sent with every GitHub REST API request.
+
+    Args:
+        token: GitHub Personal Access Token used for Bearer authentication.
+
+    Returns:
+        dict[str, str]: Accept, Authorization and API version headers.
+    """
+    return {
+        "Accept": "application/vnd.github+json",
+        "Authorization": f"Bearer {token}",
+        "X-GitHub-Api-Version": GITHUB_API_VERSION,
+    }
+
+
+def _http2_available() -> bool:
+    # httpx only speaks HTTP/2 when the optional `h2` package is installed (`pip install httpx[http2]`)
+    return importlib.util.find_spec("h2") is not None
+
+
+def _resolve_http2(http2: bool) -> bool:
+    if http2 and not _http2_available():
+        print("HTTP/2 requested but the h2 package is not installed, falling back to HTTP/1.1")
+        return False
+    return http2
+
+
+class GitHubClient:
+    """Synchronous GitHub REST client backed by a single pooled `httpx.Client`.
+
+    Connections are kept alive between calls, so repeated requests against
+    api.github.com reuse the same TCP/TLS session instead of paying a new
+    handshake per call. Default headers and timeouts are set once on the
+    underlying client. Every request goes through the rate-limit governor,
+    which paces callers and retries secondary rate limit rejections.
+
+    Args:
+        token: GitHub Personal Access Token.
+        base_url: GitHub API root (default: https://api.github.com).
+        http2: Negotiate HTTP/2 when the `h2` package is available.
+        timeout: Request timeout configuration.
+        limits: Connection pool limits.
+        cache: Optional on-disk cache used to make GET requests conditional.
+        governor: Rate-limit governor; defaults to the process-wide governor for the token.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = GITHUB_API_URL,
+        http2: bool = False,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        cache: GitHubResponseCache | None = None,
+        governor: RateLimitGovernor | None = None,
+    ) -> None:
+        self.token = token
+        self.base_url = base_url
+        self.cache = cache
+        self.governor = governor or get_rate_limit_governor(token)
+        self._client = httpx.Client(
+            base_url=base_url,
+            headers=github_headers(token),
+            timeout=timeout,
+            limits=limits,
+            http2=_resolve_http2(http2),
+        )
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        resource = rate_limit_resource(request.url)
+        for attempt in range(self.governor.max_retries + 1):
+            self.governor.acquire(resource)
+            response = self._client.send(request)
+            if not self.governor.observe(response, attempt):
+                break
+        return response
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        request = self._client.build_request(method, url, **kwargs)
+        if self.cache is None or method != "GET":
+            return self._send(request)
+        entry = self.cache.prepare(request, self.token)
+        response = self._send(request)
+        return self.cache.resolve(request, response, entry, self.token)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "GitHubClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncGitHubClient:
+    """Asynchronous counterpart of `GitHubClient` backed by a pooled `httpx.AsyncClient`.
+
+    Args:
+        token: GitHub Personal Access Token.
+        base_url: GitHub API root (default: https://api.github.com).
+        http2: Negotiate HTTP/2 when the `h2` package is available.
+        timeout: Request timeout configuration.
+        limits: Connection pool limits.
+        cache: Optional on-disk cache used to make GET requests conditional.
+        governor: Rate-limit governor; defaults to the process-wide governor for the token.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = GITHUB_API_URL,
+        http2: bool = False,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        cache: GitHubResponseCache | None = None,
+        governor: RateLimitGovernor | None = None,
+    ) -> None:
+        self.token = token
+        self.base_url = base_url
+        self.cache = cache
+        self.governor = governor or get_rate_limit_governor(token)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=github_headers(token),
+            timeout=timeout,
+            limits=limits,
+            http2=_resolve_http2(http2),
+        )
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        resource = rate_limit_resource(request.url)
+        for attempt in range(self.governor.max_retries + 1):
+            await self.governor.aacquire(resource)
+            response = await self._client.send(request)
+            if not self.governor.observe(response, attempt):
+                break
+        return response
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        request = self._client.build_request(method, url, **kwargs)
+        if self.cache is None or method != "GET":
+            return await self._send(request)
+        # The cache reads and writes files; keep that off the event loop
+        entry = await asyncio.to_thread(self.cache.prepare, request, self.token)
+        response = await self._send(request)
+        return await asyncio.to_thread(self.cache.resolve, request, response, entry, self.token)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -0,0 +1,116 @@
+from github_client import AsyncGitHubClient, GitHubClient, GitHubRequestError
+
+# 100 is the GraphQL maximum for `first`; one query inspects up to 100 repositories
+REPOSITORY_RULESETS_QUERY = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor, orderBy: {field: NAME, direction: ASC}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        databaseId
+        name
+        updatedAt
+        defaultBranchRef {
+          name
+        }
+        rulesets(first: 100) {
+          nodes {
+            databaseId
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Issue totals counted server side; pull requests are not included
+REPOSITORY_ISSUE_COUNTS_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    open: issues(states: OPEN) {
+      totalCount
+    }
+    closed: issues(states: CLOSED) {
+      totalCount
+    }
+  }
+}
+"""
+
+
+def _graphql_data(response) -> dict:
+    if response.status_code != 200:
+        raise GitHubRequestError(
+            f"GraphQL request failed: {response.status_code} - {response.text}", response.status_code
+        )
+    body = response.json()
+    if body.get("errors"):
+        raise GitHubRequestError(f"GraphQL request failed: {body['errors']}", response.status_code)
+    return body["data"]
+
+
+def graphql(client: GitHubClient, query: str, variables: dict | None = None) -> dict:
+    """Run a GitHub GraphQL query and return its `data` block."""
+    return _graphql_data(client.post("/graphql", json={"query": query, "variables": variables or {}}))
+
+
+async def agraphql(client: AsyncGitHubClient, query: str, variables: dict | None = None) -> dict:
+    """Async counterpart of `graphql`."""
+    return _graphql_data(await client.post("/graphql", json={"query": query, "variables": variables or {}}))
+
+
+def _repository_rulesets_page(data: dict) -> tuple[list[dict], dict]:
+    repositories = data["organization"]["repositories"]
+    repos = [
+        {
+            "id": node["databaseId"],
+            "name": node["name"],
+            "updated_at": node["updatedAt"],
+            "default_branch": (node["defaultBranchRef"] or {}).get("name"),
+            "rulesets": [{"id": ruleset["databaseId"], "name": ruleset["name"]} for ruleset in node["rulesets"]["nodes"]],
+        }
+        for node in repositories["nodes"]
+    ]
+    return repos, repositories["pageInfo"]
+
+
+async def aget_org_repositories_with_rulesets(client: AsyncGitHubClient, org: str) -> list[dict]:
+    """List every repository in an org with its default branch and rulesets, 100 repos per query.
+
+    Args:
+        client: Pooled async GitHub client.
+        org: GitHub organization name.
+
+    Returns:
+        list[dict]: One {"id", "name", "updated_at", "default_branch", "rulesets": [{"id", "name"}]}
+            dict per repository.
+    """
+    repos: list[dict] = []
+    cursor = None
+    while True:
+        data = await agraphql(client, REPOSITORY_RULESETS_QUERY, {"org": org, "cursor": cursor})
+        page_repos, page_info = _repository_rulesets_page(data)
+        repos += page_repos
+        if not page_info["hasNextPage"]:
+            return repos
+        cursor = page_info["endCursor"]
+
+
+def get_repository_issue_counts(client: GitHubClient, repository: str) -> dict[str, int]:
+    """Count a repository's open and closed issues with a single GraphQL query.
+
+    Args:
+        client: Pooled GitHub client.
+        repository: Repository in the format "owner/repo".
+
+    Returns:
+        dict[str, int]: {"open": <count>, "closed": <count>}.
+    """
+    owner, name = repository.split("/", 1)
+    data = graphql(client, REPOSITORY_ISSUE_COUNTS_QUERY, {"owner": owner, "name": name})
+    return {state: data["repository"][state]["totalCount"] for state in ("open", "closed")}
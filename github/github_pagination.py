@@ -0,0 +1,103 @@
+import asyncio
+import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from github_client import AsyncGitHubClient, GitHubClient, GitHubRequestError
+
+MAX_PER_PAGE = 100
+
+_LINK_PATTERN = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+
+
+def parse_link_header(link_header: str | None) -> dict[str, str]:
+    """Parse a GitHub `Link` header into a {rel: url} mapping."""
+    if not link_header:
+        return {}
+    return {rel: url for url, rel in _LINK_PATTERN.findall(link_header)}
+
+
+def last_page_number(response: httpx.Response) -> int:
+    """Read the page number of `rel="last"` from a response, or 1 when there is only one page."""
+    last_url = parse_link_header(response.headers.get("Link")).get("last")
+    if not last_url:
+        return 1
+    return int(httpx.URL(last_url).params.get("page", 1))
+
+
+def _check(response: httpx.Response, url: str) -> list[dict]:
+    if response.status_code != 200:
+        raise GitHubRequestError(
+            f"Failed to fetch {url}: {response.status_code} - {response.text}", response.status_code
+        )
+    return response.json()
+
+
+async def apaginate(
+    client: AsyncGitHubClient,
+    url: str,
+    params: dict | None = None,
+    per_page: int = MAX_PER_PAGE,
+    concurrency: int = 8,
+) -> list[dict]:
+    """Fetch every page of a GitHub list endpoint, fetching pages after the first concurrently.
+
+    The `rel="last"` entry of the first page's `Link` header tells how many
+    pages exist; the remaining pages are then requested at once over the same
+    pooled client, at most `concurrency` at a time. Items are returned in page
+    order regardless of completion order.
+
+    Raises:
+        GitHubRequestError: If any page returns a non-200 status code.
+    """
+    base_params = {**(params or {}), "per_page": per_page}
+
+    first = await client.get(url, params={**base_params, "page": 1})
+    items: list[dict] = list(_check(first, url))
+    last_page = last_page_number(first)
+    if last_page == 1:
+        return items
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(page: int) -> list[dict]:
+        async with semaphore:
+            return _check(await client.get(url, params={**base_params, "page": page}), url)
+
+    for page_items in await asyncio.gather(*(fetch(page) for page in range(2, last_page + 1))):
+        items.extend(page_items)
+    return items
+
+
+def iter_pages(
+    client: GitHubClient, url: str, params: dict | None = None, per_page: int = MAX_PER_PAGE
+) -> Iterator[list[dict]]:
+    """Yield a GitHub list endpoint page by page, downloading one page ahead of the consumer.
+
+    Pages are followed through `rel="next"` Link headers. While the caller
+    processes the page just yielded, the next page is already being fetched
+    on a background thread, so only two pages are ever held in memory.
+
+    Args:
+        client: Pooled GitHub client.
+        url: List endpoint path (e.g. "/repos/{owner}/{repo}/issues").
+        params: Extra query parameters for the first page.
+        per_page: Items per page (GitHub caps this at 100).
+
+    Yields:
+        list[dict]: The items of one page.
+
+    Raises:
+        GitHubRequestError: If any page returns a non-200 status code.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(client.get, url, params={**(params or {}), "per_page": per_page, "page": 1})
+        while pending is not None:
+            response = pending.result()
+            page_items = _check(response, url)
+            next_url = parse_link_header(response.headers.get("Link")).get("next")
+            # Start the next download before handing this page to the consumer
+            pending = executor.submit(client.get, next_url) if next_url else None
+            yield page_items
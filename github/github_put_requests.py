@@ -0,0 +1,19 @@
+from github_client import AsyncGitHubClient, GitHubRequestError
+from github_post_requests import MAIN_PROTECTION_RULESET
+
+
+async def aupdate_repo_ruleset(
+    client: AsyncGitHubClient, org: str, repo_name: str, ruleset_id: int, data: dict = MAIN_PROTECTION_RULESET
+) -> dict:
+    """Replace an existing repository ruleset with `data` in a single PUT.
+
+    Returns:
+        dict: The updated ruleset.
+
+    Raises:
+        GitHubRequestError: If GitHub does not answer 200.
+    """
+    response = await client.put(f"/repos/{org}/{repo_name}/rulesets/{ruleset_id}", json=data)
+    if response.status_code != 200:
+        raise GitHubRequestError(f"update ruleset: {response.status_code}", response.status_code)
+    return response.json()
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+
+import httpx
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE_SECONDS = 2.0
+DEFAULT_MAX_BACKOFF_SECONDS = 120.0
+# Once less than this fraction of the hourly budget is left, requests are spread evenly until the reset
+DEFAULT_PACING_FRACTION = 0.1
+
+
+def rate_limit_resource(url: httpx.URL | str) -> str:
+    """Name of the GitHub rate limit resource (`X-RateLimit-Resource`) a request to `url` is counted against."""
+    path = httpx.URL(url).path
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class _Bucket:
+    """Budget of one rate limit resource, as last reported by GitHub."""
+
+    def __init__(self) -> None:
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.blocked_until = 0.0
+        self.next_paced_slot = 0.0
+
+
+class RateLimitGovernor:
+    """Token-bucket governor shared by every GitHub caller using the same token.
+
+    GitHub budgets REST (`core`), GraphQL and search separately, so one bucket
+    is kept per `X-RateLimit-Resource`. Each bucket's size and refill time are
+    learned from the `X-RateLimit-Limit`, `X-RateLimit-Remaining` and
+    `X-RateLimit-Reset` headers of the responses for that resource.
+    Every request reserves a token before it is sent, so concurrent callers
+    (threads or asyncio tasks) never overspend the remaining budget. When the
+    budget runs low the remaining tokens are spread evenly over the time left
+    until the reset, and when it is exhausted callers of that resource wait for
+    the reset.
+
+    403/429 secondary rate limit responses pause all callers, honouring
+    `Retry-After` when present and otherwise backing off exponentially with
+    jitter, and tell the caller to retry.
+
+    Throttling time and retry counts are exposed through `stats()`.
+
+    Args:
+        max_retries: Retries allowed per request after a rate limit response.
+        backoff_base_seconds: First backoff step for secondary limits without Retry-After.
+        max_backoff_seconds: Upper bound for a single backoff.
+        pacing_fraction: Fraction of the budget below which requests are paced.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS,
+        pacing_fraction: float = DEFAULT_PACING_FRACTION,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.pacing_fraction = pacing_fraction
+
+        self._buckets: dict[str, _Bucket] = {}
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.retries = 0
+        self.throttle_events = 0
+        self.throttled_seconds = 0.0
+
+    def _bucket(self, resource: str) -> _Bucket:
+        bucket = self._buckets.get(resource)
+        if bucket is None:
+            bucket = self._buckets[resource] = _Bucket()
+        return bucket
+
+    def reserve(self, resource: str = "core") -> float:
+        """Reserve a token of `resource` for one request and return how many seconds to wait before sending it."""
+        with self._lock:
+            bucket = self._bucket(resource)
+            now = time.time()
+            wait = max(0.0, self._blocked_until - now, bucket.blocked_until - now)
+
+            if bucket.reset_at is not None and now + wait >= bucket.reset_at:
+                # The window will have rolled over by the time this request goes out
+                bucket.remaining = None
+                bucket.reset_at = None
+
+            if bucket.remaining is not None and bucket.reset_at is not None:
+                if bucket.remaining <= 0:
+                    # Budget spent: hold every caller of this resource until the window resets
+                    bucket.blocked_until = max(bucket.blocked_until, bucket.reset_at + 1.0)
+                    wait = max(wait, bucket.blocked_until - now)
+                    bucket.remaining = None
+                    bucket.reset_at = None
+                else:
+                    if bucket.limit and bucket.remaining < bucket.limit * self.pacing_fraction:
+                        interval = (bucket.reset_at - now) / bucket.remaining
+                        slot = max(now + wait, bucket.next_paced_slot)
+                        bucket.next_paced_slot = slot + interval
+                        wait = slot - now
+                    bucket.remaining -= 1
+
+            self.requests += 1
+            if wait > 0:
+                self.throttle_events += 1
+                self.throttled_seconds += wait
+            return wait
+
+    def acquire(self, resource: str = "core") -> None:
+        wait = self.reserve(resource)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, resource: str = "core") -> None:
+        wait = self.reserve(resource)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, response: httpx.Response, attempt: int) -> bool:
+        """Learn the budget from a response and report whether the request should be retried.
+
+        Args:
+            response: Response returned by GitHub.
+            attempt: Zero-based attempt number for this request.
+
+        Returns:
+            bool: True when the response was a rate limit rejection and a retry is allowed.
+        """
+        headers = response.headers
+        now = time.time()
+        with self._lock:
+            resource = headers.get("X-RateLimit-Resource") or rate_limit_resource(response.request.url)
+            bucket = self._bucket(resource)
+            if "X-RateLimit-Remaining" in headers and "X-RateLimit-Reset" in headers:
+                header_remaining = int(headers["X-RateLimit-Remaining"])
+                header_reset = float(headers["X-RateLimit-Reset"])
+                bucket.limit = int(headers.get("X-RateLimit-Limit", bucket.limit or 0)) or bucket.limit
+                if bucket.reset_at is None or bucket.remaining is None or header_reset != bucket.reset_at:
+                    bucket.reset_at = header_reset
+                    bucket.remaining = header_remaining
+                else:
+                    # Responses can arrive out of order; never trust a staler, larger count
+                    bucket.remaining = min(bucket.remaining, header_remaining)
+
+            if response.status_code not in (403, 429):
+                return False
+
+            retry_after = headers.get("Retry-After")
+            primary = False
+            if retry_after is not None:
+                delay = float(retry_after)
+            elif headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+                delay = float(headers["X-RateLimit-Reset"]) - now + 1.0
+                primary = True
+            elif response.status_code == 429 or "rate limit" in response.text.lower():
+                backoff = min(self.max_backoff_seconds, self.backoff_base_seconds * 2**attempt)
+                delay = backoff + random.uniform(0, backoff)
+            else:
+                # A plain 403 is a permissions problem, not a rate limit
+                return False
+
+            if attempt >= self.max_retries:
+                return False
+
+            self.retries += 1
+            if primary:
+                # An exhausted budget only holds callers of the same resource
+                bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            else:
+                self._blocked_until = max(self._blocked_until, now + delay)
+            return True
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttle_events": self.throttle_events,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "resources": {
+                resource: {"remaining": bucket.remaining, "limit": bucket.limit}
+                for resource, bucket in self._buckets.items()
+            },
+        }
+
+
+# GitHub budgets are per token, so every client using the same token shares one governor
+_shared_governors: dict[str, RateLimitGovernor] = {}
+_shared_governors_lock = threading.Lock()
+
+
+def get_rate_limit_governor(token: str) -> RateLimitGovernor:
+    """Return the process-wide governor for a token, creating it on first use."""
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    with _shared_governors_lock:
+        governor = _shared_governors.get(key)
+        if governor is None:
+            governor = RateLimitGovernor()
+            _shared_governors[key] = governor
+        return governor
@@ -0,0 +1,13 @@
+import json
+import os
+
+
+def write_json_atomic(path: str, data) -> None:
+    """Write `data` as JSON to `path` through a temporary file, so readers never see a half-written file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
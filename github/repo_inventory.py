@@ -0,0 +1,161 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from github_client import AsyncGitHubClient, GitHubRequestError
+from json_files import write_json_atomic
+
+SNAPSHOT_VERSION = 1
+# Outcomes that mean the repo matched the spec when it was last checked
+SETTLED_OUTCOMES = ("unchanged", "created", "replaced")
+
+
+def empty_snapshot() -> dict:
+    return {"version": SNAPSHOT_VERSION, "last_run": None, "repos": {}}
+
+
+class JsonFileInventoryStore:
+    """Keeps the repo inventory snapshot in a local JSON file.
+
+    Args:
+        path: Location of the snapshot file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return empty_snapshot()
+
+    def save(self, snapshot: dict) -> None:
+        write_json_atomic(self.path, snapshot)
+
+
+class S3InventoryStore:
+    """Keeps the repo inventory snapshot as a JSON object in S3, for Lambda runs that outlive /tmp.
+
+    Args:
+        bucket: S3 bucket name.
+        key: Object key of the snapshot.
+    """
+
+    def __init__(self, bucket: str, key: str) -> None:
+        import boto3
+
+        self.bucket = bucket
+        self.key = key
+        self._s3 = boto3.client("s3")
+
+    def load(self) -> dict:
+        try:
+            body = self._s3.get_object(Bucket=self.bucket, Key=self.key)["Body"].read()
+        except self._s3.exceptions.NoSuchKey:
+            return empty_snapshot()
+        return json.loads(body)
+
+    def save(self, snapshot: dict) -> None:
+        self._s3.put_object(Bucket=self.bucket, Key=self.key, Body=json.dumps(snapshot).encode("utf-8"))
+
+
+def inventory_store_from_env() -> JsonFileInventoryStore | S3InventoryStore | None:
+    """Pick the snapshot store from INVENTORY_S3_BUCKET (+ INVENTORY_S3_KEY) or INVENTORY_PATH; None if neither is set."""
+    if os.getenv("INVENTORY_S3_BUCKET"):
+        return S3InventoryStore(
+            bucket=os.environ["INVENTORY_S3_BUCKET"],
+            key=os.getenv("INVENTORY_S3_KEY", "github/repo_inventory.json"),
+        )
+    if os.getenv("INVENTORY_PATH"):
+        return JsonFileInventoryStore(path=os.environ["INVENTORY_PATH"])
+    return None
+
+
+def is_unchanged(snapshot: dict, repo: dict) -> bool:
+    """True when the snapshot already has this repo at the same `updated_at` and it was settled last time."""
+    known = snapshot["repos"].get(repo["name"])
+    return (
+        known is not None
+        and known["id"] == repo["id"]
+        and known["updated_at"] == repo["updated_at"]
+        and known["outcome"] in SETTLED_OUTCOMES
+    )
+
+
+async def list_changed_repositories(client: AsyncGitHubClient, org: str, snapshot: dict) -> list[dict]:
+    """List repos created or updated since the snapshot, newest first, stopping at the first unchanged page.
+
+    Repositories are requested sorted by `updated` descending, so once a page
+    reaches a repo the snapshot already has at the same `updated_at`,
+    everything after it is older and unchanged, and paging stops there.
+    Repos whose last reconciliation did not settle (e.g. failed) are added back
+    so they are retried; ones that no longer exist drop out of the snapshot at
+    the next full sweep (see `record_results`).
+
+    Args:
+        client: Shared async GitHub client.
+        org: GitHub organization name.
+        snapshot: Snapshot from a previous run.
+
+    Returns:
+        list[dict]: {"id", "name", "updated_at"} for every repo that needs re-inspection.
+    """
+    changed: list[dict] = []
+    page = 1
+    reached_unchanged = False
+
+    while not reached_unchanged:
+        response = await client.get(
+            f"/orgs/{org}/repos", params={"sort": "updated", "direction": "desc", "per_page": 100, "page": page}
+        )
+        if response.status_code != 200:
+            raise GitHubRequestError(
+                f"Failed to fetch repositories: {response.status_code} - {response.text}", response.status_code
+            )
+        page_repos: list[dict] = response.json()
+
+        for repo in page_repos:
+            if is_unchanged(snapshot, repo):
+                reached_unchanged = True
+                break
+            changed.append({"id": repo["id"], "name": repo["name"], "updated_at": repo["updated_at"]})
+
+        if len(page_repos) < 100:
+            break
+        page += 1
+
+    changed_names = {repo["name"] for repo in changed}
+    for name, known in snapshot["repos"].items():
+        if known["outcome"] not in SETTLED_OUTCOMES and name not in changed_names:
+            changed.append({"id": known["id"], "name": name, "updated_at": known["updated_at"]})
+
+    return changed
+
+
+def record_results(snapshot: dict, repos: list[dict], results: list[dict], full_sweep: bool = False) -> dict:
+    """Write the reconciled repos and their ruleset outcomes into the snapshot.
+
+    `repos` of a full sweep is the complete org listing, so entries for repos
+    missing from it (deleted, transferred or renamed since) are dropped;
+    otherwise an unsettled entry would be retried on every incremental run.
+    """
+    checked_at = datetime.now(timezone.utc).isoformat()
+    results_by_repo = {result["repo"]: result for result in results}
+    if full_sweep:
+        listed = {repo["name"] for repo in repos}
+        snapshot["repos"] = {name: known for name, known in snapshot["repos"].items() if name in listed}
+    for repo in repos:
+        result = results_by_repo.get(repo["name"])
+        if result is None:
+            continue
+        snapshot["repos"][repo["name"]] = {
+            "id": repo["id"],
+            "updated_at": repo["updated_at"],
+            "outcome": result["outcome"],
+            "detail": result["detail"],
+            "checked_at": checked_at,
+        }
+    snapshot["last_run"] = checked_at
+    return snapshot
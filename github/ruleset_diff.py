@@ -0,0 +1,66 @@
+def _rule_key(rule: dict) -> str:
+    return rule["type"]
+
+
+def _actor_key(actor: dict) -> tuple:
+    return (str(actor.get("actor_type")), str(actor.get("actor_id")))
+
+
+def _diff(existing, desired, path: str, changes: list[str]) -> None:
+    if isinstance(desired, dict):
+        if not isinstance(existing, dict):
+            changes.append(f"{path}: {existing!r} -> {desired!r}")
+            return
+        # GitHub fills in defaults for parameters we never set, so only the keys we specify are compared
+        for key, value in desired.items():
+            _diff(existing.get(key), value, f"{path}.{key}" if path else key, changes)
+        return
+
+    if isinstance(desired, list) and desired and all(isinstance(item, dict) and "type" in item for item in desired):
+        _diff_keyed_list(existing or [], desired, _rule_key, path, changes)
+        return
+
+    if isinstance(desired, list) and desired and all(isinstance(item, dict) and "actor_id" in item for item in desired):
+        _diff_keyed_list(existing or [], desired, _actor_key, path, changes)
+        return
+
+    if isinstance(desired, list):
+        if sorted(map(repr, existing or [])) != sorted(map(repr, desired)):
+            changes.append(f"{path}: {existing!r} -> {desired!r}")
+        return
+
+    if existing != desired:
+        changes.append(f"{path}: {existing!r} -> {desired!r}")
+
+
+def _diff_keyed_list(existing: list[dict], desired: list[dict], key, path: str, changes: list[str]) -> None:
+    existing_by_key = {key(item): item for item in existing}
+    desired_by_key = {key(item): item for item in desired}
+    for item_key, item in desired_by_key.items():
+        if item_key not in existing_by_key:
+            changes.append(f"{path}[{item_key}]: missing -> {item!r}")
+        else:
+            _diff(existing_by_key[item_key], item, f"{path}[{item_key}]", changes)
+    for item_key, item in existing_by_key.items():
+        if item_key not in desired_by_key:
+            changes.append(f"{path}[{item_key}]: {item!r} -> removed")
+
+
+def diff_rulesets(existing: dict, desired: dict) -> list[str]:
+    """Compare an existing ruleset (as returned by GitHub) with the desired spec.
+
+    Read-only fields GitHub adds (id, source, node_id, _links, timestamps, ...)
+    and parameter defaults the spec does not set are ignored. Rules are matched
+    by type and bypass actors by (actor_type, actor_id), so ordering never
+    counts as drift.
+
+    Args:
+        existing: Ruleset payload from GET /repos/{org}/{repo}/rulesets/{id}.
+        desired: Desired ruleset spec (e.g. MAIN_PROTECTION_RULESET).
+
+    Returns:
+        list[str]: One "path: existing -> desired" line per difference; empty when in sync.
+    """
+    changes: list[str] = []
+    _diff(existing, desired, "", changes)
+    return changes
@@ -0,0 +1,230 @@
+import asyncio
+import time
+
+from github_cache import cache_from_env
+from github_client import AsyncGitHubClient
+from github_get_requests import aget_ruleset_info, alist_repo_rulesets
+from github_graphql import aget_org_repositories_with_rulesets
+from github_pagination import apaginate
+from github_post_requests import MAIN_PROTECTION_RULESET, acreate_repo_ruleset
+from github_put_requests import aupdate_repo_ruleset
+from repo_inventory import (
+    JsonFileInventoryStore,
+    S3InventoryStore,
+    list_changed_repositories,
+    record_results,
+)
+from ruleset_diff import diff_rulesets
+
+OUTCOMES = ("unchanged", "created", "replaced", "would_create", "would_replace", "failed")
+
+
+async def list_org_repositories(client: AsyncGitHubClient, org: str) -> list[dict]:
+    """List every repository in an organization, fetching pages concurrently."""
+    return await apaginate(client, f"/orgs/{org}/repos")
+
+
+def find_ruleset_id(rulesets: list[dict], name: str) -> int | None:
+    for rule in rulesets:
+        if rule["name"] == name:
+            return rule["id"]
+    return None
+
+
+async def reconcile_repo(
+    client: AsyncGitHubClient,
+    org: str,
+    repo_name: str,
+    overwrite: bool,
+    ruleset: dict = MAIN_PROTECTION_RULESET,
+    rulesets: list[dict] | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """Bring one repository's ruleset in line with the desired spec.
+
+    A missing ruleset is created. An existing one is only touched when
+    `overwrite` is set: it is fetched, diffed against the desired spec and
+    updated in place with a single PUT when they differ.
+
+    Args:
+        client: Shared async GitHub client.
+        org: GitHub organization name.
+        repo_name: Repository to reconcile.
+        overwrite: Update an existing ruleset with the same name when it has drifted.
+        ruleset: Desired ruleset payload (default: MAIN_PROTECTION_RULESET).
+        rulesets: The repo's existing rulesets ({"id", "name"} dicts) when already known,
+            e.g. from the GraphQL inspection; listed over REST when omitted.
+        dry_run: Plan only; report "would_create" / "would_replace" and the diff without writing.
+
+    Returns:
+        dict: {"repo": repo_name, "outcome": one of OUTCOMES, "detail": str, "diff": list[str]}
+    """
+    try:
+        if rulesets is None:
+            rulesets = await alist_repo_rulesets(client=client, org=org, repo_name=repo_name)
+
+        existing_id = find_ruleset_id(rulesets, ruleset["name"])
+
+        if existing_id is None:
+            if dry_run:
+                return {"repo": repo_name, "outcome": "would_create", "detail": "ruleset missing"}
+            created = await acreate_repo_ruleset(client=client, org=org, repo_name=repo_name, data=ruleset)
+            return {"repo": repo_name, "outcome": "created", "detail": f"created ruleset {created.get('id')}"}
+
+        if not overwrite:
+            return {"repo": repo_name, "outcome": "unchanged", "detail": f"ruleset {existing_id} present"}
+
+        existing = await aget_ruleset_info(client=client, org=org, repo_name=repo_name, ruleset_id=existing_id)
+        changes = diff_rulesets(existing=existing, desired=ruleset)
+        if not changes:
+            return {"repo": repo_name, "outcome": "unchanged", "detail": f"ruleset {existing_id} in sync"}
+
+        if dry_run:
+            return {"repo": repo_name, "outcome": "would_replace", "detail": f"ruleset {existing_id} drifted", "diff": changes}
+
+        await aupdate_repo_ruleset(client=client, org=org, repo_name=repo_name, ruleset_id=existing_id, data=ruleset)
+        return {"repo": repo_name, "outcome": "replaced", "detail": f"updated ruleset {existing_id}", "diff": changes}
+
+    except Exception as e:
+        return {"repo": repo_name, "outcome": "failed", "detail": str(e)}
+
+
+def summarize_results(results: list[dict], elapsed_seconds: float) -> dict:
+    """Collapse per-repo results into counts plus the repo names behind each outcome."""
+    summary: dict = {"total": len(results), "elapsed_seconds": round(elapsed_seconds, 3)}
+    for outcome in OUTCOMES:
+        summary[outcome] = [result["repo"] for result in results if result["outcome"] == outcome]
+    summary["counts"] = {outcome: len(summary[outcome]) for outcome in OUTCOMES}
+    summary["results"] = results
+    return summary
+
+
+async def reconcile_org_rulesets(
+    org: str,
+    token: str,
+    overwrite: bool = False,
+    concurrency: int = 10,
+    client: AsyncGitHubClient | None = None,
+    inspection: str = "graphql",
+    dry_run: bool = False,
+    inventory_store: JsonFileInventoryStore | S3InventoryStore | None = None,
+    full_sweep: bool = False,
+) -> dict:
+    """Reconcile the main-protection ruleset across every repository in an org.
+
+    Repositories are processed concurrently, with at most `concurrency` repos
+    in flight at once over a single pooled async client.
+
+    With `inspection="graphql"` the repos and their existing rulesets are read
+    100 at a time through GraphQL, and REST is only called for repos that need
+    a create or replace. `inspection="rest"` lists the rulesets of every repo
+    over REST instead.
+
+    With an `inventory_store`, the snapshot from the previous run limits the
+    work to repos created or updated since then (see
+    `repo_inventory.list_changed_repositories`); the first run, or a
+    `full_sweep`, inspects everything and seeds the snapshot.
+
+    Args:
+        org: GitHub organization name.
+        token: GitHub Personal Access Token with administration:write on the org's repos.
+        overwrite: Update existing main-protection rulesets that have drifted from the spec.
+        concurrency: Maximum number of repositories reconciled at the same time.
+        client: Optional existing async client; one is created (and closed) if omitted.
+        inspection: "graphql" (default) or "rest".
+        dry_run: Plan only; no rulesets are created or updated (and the snapshot is not saved).
+        inventory_store: Optional snapshot store with load()/save() (see repo_inventory).
+        full_sweep: Ignore the snapshot and inspect every repo.
+
+    Returns:
+        dict: Summary from `summarize_results` with per-outcome repo lists and counts.
+    """
+    owns_client = client is None
+    client = client or AsyncGitHubClient(token=token, cache=cache_from_env())
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(repo: dict) -> dict:
+        async with semaphore:
+            return await reconcile_repo(
+                client=client,
+                org=org,
+                repo_name=repo["name"],
+                overwrite=overwrite,
+                rulesets=repo.get("rulesets"),
+                dry_run=dry_run,
+            )
+
+    snapshot = inventory_store.load() if inventory_store is not None else None
+    incremental = bool(snapshot and snapshot["repos"]) and not full_sweep
+
+    start = time.perf_counter()
+    try:
+        if incremental:
+            repos = await list_changed_repositories(client=client, org=org, snapshot=snapshot)
+        elif inspection == "graphql":
+            repos = await aget_org_repositories_with_rulesets(client=client, org=org)
+        else:
+            repos = await list_org_repositories(client=client, org=org)
+        results = await asyncio.gather(*(bounded(repo) for repo in repos))
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    if snapshot is not None and not dry_run:
+        # A full pass lists every repo, so entries for repos that are gone are pruned
+        inventory_store.save(
+            record_results(snapshot=snapshot, repos=repos, results=list(results), full_sweep=not incremental)
+        )
+
+    summary = summarize_results(results=list(results), elapsed_seconds=time.perf_counter() - start)
+    summary["incremental"] = incremental
+    if client.cache is not None:
+        summary["cache"] = client.cache.stats()
+    summary["rate_limit"] = client.governor.stats()
+    return summary
+
+
+def run_reconciliation(
+    org: str,
+    token: str,
+    overwrite: bool = False,
+    concurrency: int = 10,
+    inspection: str = "graphql",
+    dry_run: bool = False,
+    inventory_store: JsonFileInventoryStore | S3InventoryStore | None = None,
+    full_sweep: bool = False,
+) -> dict:
+    """Synchronous entry point wrapping `reconcile_org_rulesets` in `asyncio.run`."""
+    return asyncio.run(
+        reconcile_org_rulesets(
+            org=org,
+            token=token,
+            overwrite=overwrite,
+            concurrency=concurrency,
+            inspection=inspection,
+            dry_run=dry_run,
+            inventory_store=inventory_store,
+            full_sweep=full_sweep,
+        )
+    )
+
+
+def print_summary(summary: dict) -> None:
+    counts = summary["counts"]
+    print(
+        f"-- Reconciled {summary['total']} {'changed ' if summary.get('incremental') else ''}repos"
+        f" in {summary['elapsed_seconds']}s: "
+        + ", ".join(f"{outcome}={counts[outcome]}" for outcome in OUTCOMES)
+        + " --"
+    )
+    if "cache" in summary:
+        print(f"-- GitHub response cache: {summary['cache']} --")
+    if "rate_limit" in summary:
+        print(f"-- GitHub rate limit governor: {summary['rate_limit']} --")
+    for result in summary["results"]:
+        if result["outcome"] == "failed":
+            print(f"-- Failed {result['repo']}: {result['detail']} --")
+        elif result.get("diff"):
+            print(f"-- {result['outcome']} {result['repo']}: {result['detail']} --")
+            for change in result["diff"]:
+                print(f"     {change}")
@@ -0,0 +1,31 @@
+from repo_inventory import empty_snapshot, record_results
+
+
+def repo(name: str, updated_at: str = "2026-10-01T00:00:00Z") -> dict:
+    return {"id": hash(name), "name": name, "updated_at": updated_at}
+
+
+def snapshot_with(*names: str, outcome: str = "failed") -> dict:
+    snapshot = empty_snapshot()
+    for name in names:
+        snapshot["repos"][name] = {**repo(name), "outcome": outcome, "detail": "", "checked_at": None}
+    return snapshot
+
+
+def test_full_sweep_drops_repos_missing_from_the_listing():
+    snapshot = snapshot_with("kept", "deleted")
+    results = [{"repo": "kept", "outcome": "unchanged", "detail": "ruleset 1 present"}]
+
+    snapshot = record_results(snapshot, repos=[repo("kept")], results=results, full_sweep=True)
+
+    assert set(snapshot["repos"]) == {"kept"}
+    assert snapshot["repos"]["kept"]["outcome"] == "unchanged"
+
+
+def test_incremental_run_keeps_unlisted_repos():
+    snapshot = snapshot_with("retried", "untouched", outcome="unchanged")
+    results = [{"repo": "retried", "outcome": "created", "detail": "created ruleset 2"}]
+
+    snapshot = record_results(snapshot, repos=[repo("retried")], results=results)
+
+    assert set(snapshot["repos"]) == {"retried", "untouched"}
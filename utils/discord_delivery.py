@@ -0,0 +1,247 @@
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Coroutine
+
+import httpx
+
+# Statuses worth retrying; 429 is handled separately from Discord's retry_after
+TRANSIENT_STATUS_CODES: tuple[int, ...] = (500, 502, 503, 504)
+
+
+class DiscordDeliveryError(Exception):
+    """Raised when messages could not be delivered after all retries."""
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class DiscordDeliveryQueue:
+    """Delivers Discord webhook messages in order while respecting Discord's rate limits.
+
+    Every webhook URL gets its own FIFO queue and worker, so messages to one
+    webhook always arrive in the order they were enqueued while different
+    webhooks are delivered concurrently over one pooled `httpx.AsyncClient`.
+
+    Before each send the worker waits until the webhook's rate-limit bucket
+    (from `X-RateLimit-Bucket` / `X-RateLimit-Remaining` /
+    `X-RateLimit-Reset-After`) has room. A 429 is retried after the
+    `retry_after` Discord returns, and a global 429 pauses every webhook.
+    5xx responses and network errors are retried with exponential backoff and
+    jitter; any other status fails the message.
+
+    Args:
+        client: Optional shared `httpx.AsyncClient`; one is created (and closed) if omitted.
+        max_retries: Retries per message before it is recorded as failed.
+        backoff_base_seconds: First backoff for transient failures, doubled per retry.
+        max_backoff_seconds: Upper bound for a single backoff.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        max_retries: int = 5,
+        backoff_base_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+    ) -> None:
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=10.0))
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        # webhook url -> Discord bucket id, bucket id -> (remaining, reset monotonic time)
+        self._url_buckets: dict[str, str] = {}
+        self._buckets: dict[str, tuple[int, float]] = {}
+        self._global_blocked_until: float = 0.0
+
+        self._latencies: list[float] = []
+        self._delivered = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._failures: list[str] = []
+
+    async def enqueue(self, webhook_url: str, payload: dict) -> None:
+        """Queue a webhook payload ({"content": ..., "embeds": [...]}) for delivery."""
+        queue = self._queues.get(webhook_url)
+        if queue is None:
+            queue = self._queues[webhook_url] = asyncio.Queue()
+            self._workers[webhook_url] = asyncio.create_task(self._worker(webhook_url, queue))
+        await queue.put((payload, time.monotonic()))
+
+    async def drain(self) -> dict:
+        """Wait until every queued message was delivered or failed and return `stats()`."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+        return self.stats()
+
+    async def aclose(self) -> None:
+        """Drain the queues, stop the workers and close the HTTP client if it is owned here."""
+        await self.drain()
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self) -> "DiscordDeliveryQueue":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def raise_for_failures(self) -> None:
+        """Raise `DiscordDeliveryError` if any message could not be delivered."""
+        if self._failures:
+            raise DiscordDeliveryError(f"{len(self._failures)} Discord message(s) failed: {self._failures}")
+
+    def stats(self) -> dict:
+        """Delivered/failed counts, retries, 429s and enqueue-to-delivery latency percentiles (seconds)."""
+        return {
+            "delivered": self._delivered,
+            "failed": len(self._failures),
+            "retries": self._retries,
+            "rate_limited": self._rate_limited,
+            "latency_p50_seconds": _percentile(self._latencies, 0.50),
+            "latency_p99_seconds": _percentile(self._latencies, 0.99),
+            "latency_max_seconds": max(self._latencies, default=None),
+        }
+
+    async def _worker(self, webhook_url: str, queue: asyncio.Queue) -> None:
+        while True:
+            payload, enqueued_at = await queue.get()
+            try:
+                await self._deliver(webhook_url, payload)
+                self._delivered += 1
+                self._latencies.append(time.monotonic() - enqueued_at)
+            except Exception as e:
+                self._failures.append(str(e))
+            finally:
+                queue.task_done()
+
+    async def _wait_for_bucket(self, webhook_url: str) -> None:
+        while True:
+            now = time.monotonic()
+            wait = self._global_blocked_until - now
+            bucket = self._buckets.get(self._url_buckets.get(webhook_url, webhook_url))
+            if bucket is not None and bucket[0] <= 0:
+                wait = max(wait, bucket[1] - now)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def _observe(self, webhook_url: str, response: httpx.Response) -> None:
+        headers = response.headers
+        bucket_id = headers.get("X-RateLimit-Bucket", webhook_url)
+        self._url_buckets[webhook_url] = bucket_id
+        if "X-RateLimit-Remaining" in headers and "X-RateLimit-Reset-After" in headers:
+            self._buckets[bucket_id] = (
+                int(headers["X-RateLimit-Remaining"]),
+                time.monotonic() + float(headers["X-RateLimit-Reset-After"]),
+            )
+
+    def _retry_after(self, response: httpx.Response) -> float:
+        try:
+            return float(response.json()["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return float(response.headers.get("Retry-After", 1.0))
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff_seconds, self.backoff_base_seconds * (2**attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _deliver(self, webhook_url: str, payload: dict) -> None:
+        attempt = 0
+        while True:
+            await self._wait_for_bucket(webhook_url)
+            try:
+                response = await self.client.post(webhook_url, json=payload)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise Exception(f"Failed to send message to Discord: {e!r}")
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                self._retries += 1
+                continue
+
+            self._observe(webhook_url, response)
+            if response.is_success:
+                return
+
+            if response.status_code == 429:
+                self._rate_limited += 1
+                retry_after = self._retry_after(response)
+                if response.headers.get("X-RateLimit-Global", "").lower() == "true":
+                    self._global_blocked_until = time.monotonic() + retry_after
+                else:
+                    bucket_id = self._url_buckets[webhook_url]
+                    self._buckets[bucket_id] = (0, time.monotonic() + retry_after)
+            elif response.status_code in TRANSIENT_STATUS_CODES:
+                await asyncio.sleep(self._backoff(attempt))
+            else:
+                raise Exception(f"Failed to send message to Discord: {response.status_code} - {response.text}")
+
+            if attempt >= self.max_retries:
+                raise Exception(f"Failed to send message to Discord: {response.status_code} - {response.text}")
+            attempt += 1
+            self._retries += 1
+
+
+class BackgroundDiscordDelivery:
+    """Runs a `DiscordDeliveryQueue` on a background event loop for synchronous callers.
+
+    `send` returns as soon as the message is queued, so a synchronous producer
+    (e.g. the issues digest formatter) keeps working while earlier messages are
+    still being delivered. `close` waits for every message and raises
+    `DiscordDeliveryError` if any of them failed.
+
+    Args:
+        webhook_url: Default webhook URL for `send`.
+        **queue_kwargs: Passed to `DiscordDeliveryQueue`.
+    """
+
+    def __init__(self, webhook_url: str, **queue_kwargs) -> None:
+        self.webhook_url = webhook_url
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="discord-delivery", daemon=True)
+        self._thread.start()
+        self.queue: DiscordDeliveryQueue = self._run(self._create_queue(queue_kwargs))
+
+    async def _create_queue(self, queue_kwargs: dict) -> DiscordDeliveryQueue:
+        # The AsyncClient has to be created on the loop that uses it
+        return DiscordDeliveryQueue(**queue_kwargs)
+
+    def _run(self, coroutine: Coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def send(self, payload: dict, webhook_url: str | None = None) -> None:
+        """Queue a payload for delivery to `webhook_url` (the default webhook if omitted)."""
+        self._run(self.queue.enqueue(webhook_url or self.webhook_url, payload))
+
+    def close(self) -> dict:
+        """Deliver everything still queued, stop the background loop and return the delivery stats."""
+        try:
+            self._run(self.queue.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+        stats = self.queue.stats()
+        print(f"Discord delivery: {stats}")
+        self.queue.raise_for_failures()
+        return stats
+
+    def __enter__(self) -> "BackgroundDiscordDelivery":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -2,34 +2,89 @@ import asyncio
 import os
 import re
 import sys
+import threading
 
 import boto3
-from boto3.s3.transfer import TransferConfig
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
+from s3transfer.subscribers import BaseSubscriber
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from utils.files_and_directories import list_files_recursively
 
+# Files uploading at once, and threads (= concurrent part requests) shared by all of them
+MAX_CONCURRENT_FILES = int(os.getenv("S3_UPLOAD_CONCURRENCY", "8"))
+MAX_THREADS = int(os.getenv("S3_UPLOAD_THREADS", "32"))
 
-async def upload_s3_obj(file_name: str, s3_key: str, s3_bucket: str, max_retries: int = 3) -> str:
+MB = 1024 * 1024
+
+_transfer_manager = None
+_transfer_manager_lock = threading.Lock()
+
+
+def create_s3_transfer_manager(max_threads: int = MAX_THREADS, client=None):
+    """Create a transfer manager whose thread pool is the upload budget for every file it is given.
+
+    boto3 clients are thread-safe, so one client (with a connection pool as
+    large as the thread budget) serves all transfer threads.
+
+    Args:
+        max_threads: Total threads sending parts, across all files.
+        client: S3 client; one with a matching connection pool is created when omitted.
+    """
+    client = client or boto3.client("s3", config=Config(max_pool_connections=max_threads))
     config = TransferConfig(
-        multipart_threshold=1024 * 8,
-        max_concurrency=16,
-        multipart_chunksize=1024 * 16,
+        multipart_threshold=8 * MB,
+        max_concurrency=max_threads,
+        multipart_chunksize=16 * MB,
         use_threads=True,
     )
+    return create_transfer_manager(client, config)
+
+
+def get_s3_transfer_manager():
+    """Return the process-wide transfer manager, creating it on first use."""
+    global _transfer_manager
+    with _transfer_manager_lock:
+        if _transfer_manager is None:
+            _transfer_manager = create_s3_transfer_manager()
+        return _transfer_manager
+
+
+class _AsyncDoneSubscriber(BaseSubscriber):
+    # Resolves an asyncio future from the transfer thread, so no thread is spent waiting on each upload
+    def __init__(self, loop: asyncio.AbstractEventLoop, done: asyncio.Future) -> None:
+        self._loop = loop
+        self._done = done
+
+    def on_done(self, future, **kwargs) -> None:
+        self._loop.call_soon_threadsafe(self._set_done)
+
+    def _set_done(self) -> None:
+        if not self._done.done():
+            self._done.set_result(None)
+
+
+async def _upload_file(transfer_manager, file_name: str, s3_key: str, s3_bucket: str) -> None:
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    future = transfer_manager.upload(file_name, s3_bucket, s3_key, subscribers=[_AsyncDoneSubscriber(loop, done)])
+    await done
+    # Raises the upload's exception, if any
+    future.result()
+
+
+async def upload_s3_obj(
+    file_name: str, s3_key: str, s3_bucket: str, max_retries: int = 3, transfer_manager=None
+) -> str:
+    transfer_manager = transfer_manager or get_s3_transfer_manager()
 
     for attempt in range(1, max_retries + 1):
         print(f"Attempt {attempt}: Uploading {s3_key}")
         try:
-            await asyncio.to_thread(
-                boto3.client("s3").upload_file,
-                Filename=file_name,
-                Bucket=s3_bucket,
-                Key=s3_key,
-                Config=config,
-            )
+            await _upload_file(transfer_manager, file_name, s3_key, s3_bucket)
             print(f"Successfully Uploaded: {s3_key}")
             return f"Successfully Uploaded {s3_key}"
         except (BotoCoreError, ClientError, Exception) as e:
@@ -42,11 +97,29 @@ async def upload_s3_obj(file_name: str, s3_key: str, s3_bucket: str, max_retries
                 return f"Failed Upload for {s3_key} after {max_retries} attempts: {e}"
 
 
-async def bulk_s3_upload(s3_path: str, s3_bucket: str) -> list[str]:
-    dir_path = os.getcwd()
-    all_files = list_files_recursively(dir_path)
-    tasks = []
-    results = []
+async def bulk_s3_upload(
+    s3_path: str,
+    s3_bucket: str,
+    dir_path: str | None = None,
+    max_concurrent_files: int = MAX_CONCURRENT_FILES,
+    transfer_manager=None,
+) -> list[str]:
+    """Upload every file under `dir_path` (default: the working directory) to `s3_bucket` under `s3_path`.
+
+    At most `max_concurrent_files` files are in flight, and all of them share
+    one transfer manager, so the thread count stays within its budget no
+    matter how many files there are. Files start largest first so a big clip
+    is not left uploading alone at the end of the run.
+
+    Returns:
+        list[str]: One result message per file, in the order the files were listed.
+    """
+    dir_path = dir_path or os.getcwd()
+    transfer_manager = transfer_manager or get_s3_transfer_manager()
+    all_files = [
+        os.path.join(dir_path, file_path) for file_path in list_files_recursively(dir_path) if ".git" not in file_path
+    ]
+    semaphore = asyncio.Semaphore(max(1, max_concurrent_files))
 
     async def upload_task(file_path: str, s3_path: str):
         relative_path = os.path.relpath(file_path, start=dir_path)
@@ -54,23 +127,28 @@ async def bulk_s3_upload(s3_path: str, s3_bucket: str) -> list[str]:
         s3_key = relative_path.replace(os.sep, "/")  # S3 expects forward slashes
         s3_key = s3_path + s3_key
 
-        print(
-            f"""---
+        # Semaphore waiters are woken in arrival order, so the largest-first order is kept
+        async with semaphore:
+            print(
+                f"""---
 Gathered File: {file_path}
 To be Uploaded To
 S3 Key: {s3_key}"""
-        )
+            )
 
-        result = await upload_s3_obj(file_name=file_path, s3_key=s3_key, s3_bucket=s3_bucket)
+            result = await upload_s3_obj(
+                file_name=file_path, s3_key=s3_key, s3_bucket=s3_bucket, transfer_manager=transfer_manager
+            )
         return result
 
-    for file_path in all_files:
-        if not ".git" in file_path:
-            tasks.append(upload_task(file_path=file_path, s3_path=s3_path))
-    # tasks = [upload_task(file_path=file_path, s3_path=s3_path) for file_path in all_files]
+    largest_first = sorted(range(len(all_files)), key=lambda index: os.path.getsize(all_files[index]), reverse=True)
+    tasks = {
+        index: asyncio.ensure_future(upload_task(file_path=all_files[index], s3_path=s3_path))
+        for index in largest_first
+    }
     print("Files Gathered and Ready For Upload")
-    results = await asyncio.gather(*tasks)
-    return results
+    await asyncio.gather(*tasks.values())
+    return [tasks[index].result() for index in range(len(all_files))]
 
 
 if __name__ == "__main__":
@@ -92,6 +170,7 @@ if __name__ == "__main__":
             )
 
     asyncio.run(bulk_s3_upload(s3_path=user_s3_path, s3_bucket=user_s3_bucket))
+    get_s3_transfer_manager().shutdown()
 
     print("================= Upload Complete =================\n")
 